@@ -1,16 +1,40 @@
 import os
 import sys
-import importlib.util
+import statistics
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-import inspect
-import threading
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+
+# Shared GUI helpers live in the repository root, one level above the hub
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gui_events import EventChannel
+from hub_console import ConsoleSink, JobOutput
+from hub_discovery import discover_utilities, load_module, coerce_params
+from hub_workers import ProcessBackend
+from hub_cache import ResultCache
+from hub_jobs import JobQueue, DEFAULT_CONCURRENCY, DONE, install_router, uninstall_router
+from hub_metrics import profile_rows, dump_profile, load_history
+
+# Interval in milliseconds at which the elapsed time of running jobs is refreshed
+JOB_REFRESH_MS = 500
+
+# Maximum length of a result shown in the jobs panel
+JOB_RESULT_WIDTH = 80
+
+# Run history of all functions
+HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".utility_hub", "hub_stats.jsonl")
+
+def format_bytes(size):
+    """Return a byte count as a short human readable string"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
 
 class UtilityHub:
     def __init__(self, root):
         self.root = root
         self.root.title("Utility Hub")
-        self.root.geometry("800x600")
+        self.root.geometry("900x750")
         
         # Create main frame
         main_frame = ttk.Frame(root)
@@ -52,9 +76,83 @@ class UtilityHub:
         self.param_frame = ttk.LabelFrame(right_frame, text="Parameters")
         self.param_frame.pack(fill=tk.X, expand=False, padx=5, pady=5)
         
-        # Execute button
-        self.execute_button = ttk.Button(right_frame, text="Execute", command=self.execute_function)
-        self.execute_button.pack(padx=5, pady=5)
+        # Execute button and access to the complete output of the selected job
+        button_frame = ttk.Frame(right_frame)
+        button_frame.pack(padx=5, pady=5)
+        
+        self.execute_button = ttk.Button(button_frame, text="Execute", command=self.execute_function)
+        self.execute_button.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_button = ttk.Button(button_frame, text="Cancel Job", command=self.cancel_execution, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
+        self.open_output_button = ttk.Button(button_frame, text="Open Full Output", command=self.open_full_output)
+        self.open_output_button.pack(side=tk.LEFT, padx=5)
+        
+        self.clear_jobs_button = ttk.Button(button_frame, text="Clear Finished", command=self.clear_finished_jobs)
+        self.clear_jobs_button.pack(side=tk.LEFT, padx=5)
+        
+        # Execution options: separate worker process (can be cancelled), timeout and parallel jobs
+        options_frame = ttk.Frame(right_frame)
+        options_frame.pack(padx=5, pady=(0, 5))
+        
+        self.use_process = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Run in separate process", variable=self.use_process).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(options_frame, text="Timeout (s):").pack(side=tk.LEFT, padx=(10, 2))
+        self.timeout_var = tk.StringVar(value="0")
+        ttk.Entry(options_frame, textvariable=self.timeout_var, width=6).pack(side=tk.LEFT)
+        
+        ttk.Label(options_frame, text="Parallel jobs:").pack(side=tk.LEFT, padx=(10, 2))
+        self.concurrency_var = tk.StringVar(value=str(DEFAULT_CONCURRENCY))
+        ttk.Spinbox(options_frame, from_=1, to=32, textvariable=self.concurrency_var, width=4).pack(side=tk.LEFT)
+        
+        # Results of functions marked pure can be reused for identical inputs
+        cache_frame = ttk.Frame(right_frame)
+        cache_frame.pack(padx=5, pady=(0, 5))
+        
+        self.use_cache = tk.BooleanVar(value=False)
+        ttk.Checkbutton(cache_frame, text="Cache results of pure functions", variable=self.use_cache).pack(side=tk.LEFT, padx=5)
+        
+        self.cache_on_disk = tk.BooleanVar(value=False)
+        ttk.Checkbutton(cache_frame, text="Keep cache on disk", variable=self.cache_on_disk).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(cache_frame, text="Clear Cache", command=self.clear_cache).pack(side=tk.LEFT, padx=5)
+        
+        # Measurements beyond wall and CPU time, which every run records
+        measure_frame = ttk.Frame(right_frame)
+        measure_frame.pack(padx=5, pady=(0, 5))
+        
+        self.use_profiler = tk.BooleanVar(value=False)
+        ttk.Checkbutton(measure_frame, text="Profile", variable=self.use_profiler).pack(side=tk.LEFT, padx=5)
+        
+        self.trace_memory = tk.BooleanVar(value=False)
+        ttk.Checkbutton(measure_frame, text="Trace memory (slower)", variable=self.trace_memory).pack(side=tk.LEFT, padx=5)
+        
+        self.profile_button = ttk.Button(measure_frame, text="Show Profile", command=self.show_profile, state=tk.DISABLED)
+        self.profile_button.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(measure_frame, text="Function History", command=self.show_function_history).pack(side=tk.LEFT, padx=5)
+        
+        # Jobs panel: one row per execution, selecting a row shows its output
+        jobs_frame = ttk.LabelFrame(right_frame, text="Jobs")
+        jobs_frame.pack(fill=tk.X, expand=False, padx=5, pady=5)
+        
+        columns = ("function", "status", "elapsed", "cpu", "memory", "lines", "result")
+        self.jobs_tree = ttk.Treeview(jobs_frame, columns=columns, height=5, selectmode="browse")
+        self.jobs_tree.heading("#0", text="#")
+        self.jobs_tree.column("#0", width=40, stretch=False)
+        for column, title, width in (("function", "Function", 200), ("status", "Status", 80),
+                                     ("elapsed", "Elapsed", 60), ("cpu", "CPU", 60),
+                                     ("memory", "Peak Mem", 70), ("lines", "Lines", 60),
+                                     ("result", "Result", 200)):
+            self.jobs_tree.heading(column, text=title)
+            self.jobs_tree.column(column, width=width, stretch=column in ("function", "result"))
+        jobs_scrollbar = ttk.Scrollbar(jobs_frame, orient=tk.VERTICAL, command=self.jobs_tree.yview)
+        self.jobs_tree.configure(yscrollcommand=jobs_scrollbar.set)
+        self.jobs_tree.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0), pady=5)
+        jobs_scrollbar.pack(side=tk.LEFT, fill=tk.Y, pady=5)
+        self.jobs_tree.bind("<<TreeviewSelect>>", self.on_job_select)
         
         # Output console
         console_frame = ttk.LabelFrame(right_frame, text="Output Console")
@@ -63,70 +161,83 @@ class UtilityHub:
         self.console = scrolledtext.ScrolledText(console_frame, wrap=tk.WORD)
         self.console.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Redirect stdout to the console
-        self.original_stdout = sys.stdout
+        # Route stdout to the output of the job running in the current context
+        install_router()
+        
+        # Output is buffered per job and flushed to the console in batches;
+        # hub messages go to their own output, shown when no job is selected
+        self.hub_output = JobOutput()
+        self.console_sink = ConsoleSink(self.console)
+        self.console_sink.attach(self.hub_output)
+        
+        # State changes from worker threads are applied by the main loop
+        self.events = EventChannel(self.root)
+        self.events.subscribe("job", self.update_job_rows, batch=True)
+        
+        # Persistent worker processes for process mode, started on first use
+        self.process_backend = ProcessBackend()
+        self.result_cache = ResultCache()
+        self.history_path = HISTORY_FILE
+        os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+        self.job_queue = JobQueue(self.resolve_function, self.process_backend,
+                                  on_change=lambda job: self.events.post("job", job),
+                                  result_cache=self.result_cache, history_path=self.history_path)
+        self.jobs = {}
+        self.root.after(JOB_REFRESH_MS, self.refresh_running_jobs)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Initialize variables
         self.utils = {}
         self.current_util = None
+        self.current_util_name = None
         self.current_func = None
+        self.current_func_name = None
         self.param_widgets = []
         
         # Load utilities
         self.load_utilities()
     
     def load_utilities(self):
-        """Search for and load all Python scripts that start with 'util'"""
+        """Discover all Python scripts that start with 'util' without importing them"""
         try:
             # Get the current directory
             current_dir = os.path.dirname(os.path.abspath(__file__))
             
-            # Find all Python files that start with "util"
-            util_files = [f for f in os.listdir(current_dir) 
-                          if f.startswith("util") and f.endswith(".py")]
+            # Read docstrings and signatures statically (cached on disk)
+            errors = []
+            utilities = discover_utilities(current_dir, errors)
+            
+            for file, message in errors:
+                self.log(f"Error loading {file}: {message}")
             
-            if not util_files:
-                self.console.insert(tk.END, "No utility scripts found in current directory.\n")
-                self.console.see(tk.END)
+            if not utilities and not errors:
+                self.log("No utility scripts found in current directory.")
                 return
             
-            # Load each utility module
-            for file in util_files:
-                module_name = os.path.splitext(file)[0]
-                
-                try:
-                    # Load the module
-                    spec = importlib.util.spec_from_file_location(module_name, os.path.join(current_dir, file))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    
-                    # Get module description (docstring)
-                    description = module.__doc__ or "No description available"
-                    
-                    # Find all callable, non-internal functions in the module
-                    functions = {}
-                    for name, obj in inspect.getmembers(module):
-                        if inspect.isfunction(obj) and not name.startswith('_'):
-                            functions[name] = obj
-                    
-                    if functions:
-                        self.utils[module_name] = {
-                            'module': module,
-                            'description': description,
-                            'functions': functions
-                        }
-                        self.utility_listbox.insert(tk.END, module_name)
-                
-                except Exception as e:
-                    self.console.insert(tk.END, f"Error loading {file}: {str(e)}\n")
-                    self.console.see(tk.END)
+            for module_name, info in utilities.items():
+                if info['functions']:
+                    # The module itself is imported on first execution
+                    self.utils[module_name] = dict(info, module=None)
+                    self.utility_listbox.insert(tk.END, module_name)
             
-            self.console.insert(tk.END, f"Loaded {len(self.utils)} utility modules.\n")
-            self.console.see(tk.END)
+            self.log(f"Loaded {len(self.utils)} utility modules.")
             
         except Exception as e:
-            self.console.insert(tk.END, f"Error scanning for utilities: {str(e)}\n")
-            self.console.see(tk.END)
+            self.log(f"Error scanning for utilities: {str(e)}")
+    
+    def log(self, message):
+        """Write a hub message and show the hub output in the console"""
+        self.hub_output.write(f"{message}\n")
+        if self.jobs_tree.selection():
+            self.jobs_tree.selection_remove(self.jobs_tree.selection())
+        self.console_sink.attach(self.hub_output)
+    
+    def resolve_function(self, util_name, func_name):
+        """Import the utility module on first use and return the function"""
+        util = self.utils[util_name]
+        if util['module'] is None:
+            util['module'] = load_module(util_name, util['path'])
+        return getattr(util['module'], func_name)
     
     def on_utility_select(self, event):
         """Handle selection of a utility from the list"""
@@ -136,6 +247,7 @@ class UtilityHub:
         
         util_name = self.utility_listbox.get(selection[0])
         self.current_util = self.utils.get(util_name)
+        self.current_util_name = util_name
         
         if self.current_util:
             # Update utility info
@@ -156,6 +268,7 @@ class UtilityHub:
         func_name = self.func_combobox.get()
         if func_name and self.current_util:
             self.current_func = self.current_util['functions'].get(func_name)
+            self.current_func_name = func_name
             self.update_param_frame()
     
     def update_param_frame(self):
@@ -165,11 +278,9 @@ class UtilityHub:
         if not self.current_func:
             return
         
-        # Get function signature
-        sig = inspect.signature(self.current_func)
-        
-        # Create input fields for each parameter
-        for param_name, param in sig.parameters.items():
+        # Create input fields for each parameter of the cached signature
+        for param in self.current_func['params']:
+            param_name = param['name']
             if param_name == 'self':  # Skip self parameter for methods
                 continue
                 
@@ -180,22 +291,22 @@ class UtilityHub:
             label = ttk.Label(frame, text=f"{param_name}:")
             label.pack(side=tk.LEFT, padx=5)
             
-            # Default value (if any)
-            default_value = "" if param.default == inspect.Parameter.empty else str(param.default)
+            # Default value (if any); non-literal defaults are left empty and apply when empty
+            default_value = param['default'] if param['has_default'] and param['default'] is not None else ""
             
             # Create appropriate input widget based on parameter type annotation
-            if param.annotation != inspect.Parameter.empty:
-                if param.annotation == bool:
+            if param['annotation'] is not None:
+                if param['annotation'] == 'bool':
                     var = tk.BooleanVar(value=default_value == "True")
                     widget = ttk.Checkbutton(frame, variable=var)
                     widget.pack(side=tk.LEFT, fill=tk.X, expand=True)
                     self.param_widgets.append((param_name, var, 'bool'))
-                elif param.annotation == int:
+                elif param['annotation'] == 'int':
                     var = tk.StringVar(value=default_value)
                     widget = ttk.Spinbox(frame, from_=-1000, to=1000, textvariable=var)
                     widget.pack(side=tk.LEFT, fill=tk.X, expand=True)
                     self.param_widgets.append((param_name, var, 'int'))
-                elif param.annotation == float:
+                elif param['annotation'] == 'float':
                     var = tk.StringVar(value=default_value)
                     widget = ttk.Spinbox(frame, from_=-1000.0, to=1000.0, increment=0.1, textvariable=var)
                     widget.pack(side=tk.LEFT, fill=tk.X, expand=True)
@@ -222,75 +333,264 @@ class UtilityHub:
         self.param_widgets = []
     
     def execute_function(self):
-        """Execute the selected function with the provided parameters"""
+        """Queue the selected function with the provided parameters as a new job"""
         if not self.current_func:
             messagebox.showwarning("Warning", "No function selected")
             return
         
-        # Build parameters dictionary
-        params = {}
-        for param_name, var, param_type in self.param_widgets:
-            # Convert the value to the appropriate type
-            value = var.get()
-            if param_type == 'int':
-                try:
-                    value = int(value)
-                except ValueError:
-                    self.console.insert(tk.END, f"Error: Parameter '{param_name}' must be an integer\n")
-                    self.console.see(tk.END)
-                    return
-            elif param_type == 'float':
+        use_process = self.use_process.get()
+        
+        # Validate all inputs before changing any state, so an invalid value
+        # leaves the hub as it was
+        try:
+            # Build parameters dictionary, converted to the annotated types
+            params = coerce_params(self.current_func,
+                                   {param_name: var.get() for param_name, var, _ in self.param_widgets})
+            
+            # Only process runs can be cancelled while running or stopped after a timeout
+            timeout = None
+            if use_process:
                 try:
-                    value = float(value)
+                    timeout = float(self.timeout_var.get() or 0) or None
                 except ValueError:
-                    self.console.insert(tk.END, f"Error: Parameter '{param_name}' must be a float\n")
-                    self.console.see(tk.END)
-                    return
-            elif param_type == 'bool':
-                value = bool(value)
+                    raise ValueError("Timeout must be a number of seconds") from None
             
-            params[param_name] = value
+            try:
+                concurrency = int(self.concurrency_var.get())
+            except ValueError:
+                raise ValueError("Parallel jobs must be a whole number") from None
+        except ValueError as e:
+            self.log(f"Error: {str(e)}")
+            return
         
-        # Clear console
-        self.console.delete(1.0, tk.END)
+        self.job_queue.set_concurrency(concurrency)
         
-        # Custom stdout to redirect output to the console
-        class ConsoleOutput:
-            def __init__(self, console):
-                self.console = console
-            
-            def write(self, text):
-                self.console.insert(tk.END, text)
-                self.console.see(tk.END)
-                self.console.update_idletasks()
-            
-            def flush(self):
-                pass
+        util_name, func_name = self.current_util_name, self.current_func_name
+        
+        cache_key = None
+        if self.use_cache.get():
+            self.result_cache.persistent = self.cache_on_disk.get()
+            cache_key = self.result_cache.make_key(self.utils[util_name]['hash'], func_name,
+                                                   self.current_func, params)
         
-        # Redirect stdout
-        sys.stdout = ConsoleOutput(self.console)
+        # The job runs on the queue's thread pool; the GUI stays usable
+        job = self.job_queue.submit(util_name, self.utils[util_name]['path'], func_name,
+                                    params, use_process, timeout, cache_key,
+                                    module_hash=self.utils[util_name]['hash'],
+                                    profile=self.use_profiler.get(),
+                                    trace_memory=self.trace_memory.get())
+        self.jobs[str(job.id)] = job
+        self.jobs_tree.insert("", tk.END, iid=str(job.id), text=str(job.id),
+                              values=self.job_row_values(job))
+        self.jobs_tree.selection_set(str(job.id))
+        self.jobs_tree.see(str(job.id))
+    
+    def job_row_values(self, job):
+        """Return the jobs panel columns for a job"""
+        elapsed = f"{job.elapsed:.1f}s" if job.elapsed is not None else ""
+        if job.error is not None:
+            result = job.error
+        elif job.result is not None:
+            result = repr(job.result)
+        else:
+            result = ""
+        if len(result) > JOB_RESULT_WIDTH:
+            result = result[:JOB_RESULT_WIDTH - 3] + "..."
+        status = f"{job.status} (cached)" if job.cached else job.status
+        
+        cpu = memory = ""
+        if job.metrics is not None:
+            if job.metrics['cpu'] is not None:
+                cpu = f"{job.metrics['cpu']:.1f}s"
+            if job.metrics['peak_memory'] is not None:
+                memory = format_bytes(job.metrics['peak_memory'])
+        lines = job.output.lines_written if job.started is not None else ""
         
-        # Execute function in a separate thread to prevent GUI freezing
-        def run_function():
+        return (f"{job.util_name}.{job.func_name}", status, elapsed, cpu, memory, lines, result)
+    
+    def update_job_rows(self, jobs):
+        """Apply job state changes posted by the job queue (main thread)"""
+        for job in set(jobs):
+            if self.jobs_tree.exists(str(job.id)):
+                self.jobs_tree.item(str(job.id), values=self.job_row_values(job))
+        self.update_cancel_button()
+    
+    def refresh_running_jobs(self):
+        """Update the elapsed time of running jobs"""
+        try:
+            for job in self.jobs.values():
+                if job.active:
+                    self.jobs_tree.item(str(job.id), values=self.job_row_values(job))
+        finally:
             try:
-                self.execute_button.config(state=tk.DISABLED)
-                
-                # Execute the function with the provided parameters
-                result = self.current_func(**params)
-                
-                # Print the result if any
-                if result is not None:
-                    print(f"\nResult: {result}")
-                
-                print("\nExecution completed.")
-            except Exception as e:
-                print(f"\nError during execution: {str(e)}")
-            finally:
-                sys.stdout = self.original_stdout
-                self.execute_button.config(state=tk.NORMAL)
-        
-        # Start the execution thread
-        threading.Thread(target=run_function, daemon=True).start()
+                self.root.after(JOB_REFRESH_MS, self.refresh_running_jobs)
+            except tk.TclError:
+                pass  # The window has been destroyed
+    
+    def selected_job(self):
+        selection = self.jobs_tree.selection()
+        return self.jobs.get(selection[0]) if selection else None
+    
+    def on_job_select(self, event):
+        """Show the output of the selected job in the console"""
+        job = self.selected_job()
+        if job is not None:
+            self.console_sink.attach(job.output)
+        self.update_cancel_button()
+    
+    def update_cancel_button(self):
+        job = self.selected_job()
+        state = tk.NORMAL if job is not None and job.cancellable else tk.DISABLED
+        self.cancel_button.config(state=state)
+        state = tk.NORMAL if job is not None and job.profile_stats else tk.DISABLED
+        self.profile_button.config(state=state)
+    
+    def show_table(self, title, columns, rows, numeric=()):
+        """Open a window with a table whose columns sort when their heading is clicked"""
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.geometry("900x450")
+        
+        frame = ttk.Frame(window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        tree = ttk.Treeview(frame, columns=[name for name, _ in columns], show="headings")
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        
+        order = {}
+        
+        def fill(sorted_rows):
+            tree.delete(*tree.get_children())
+            for row in sorted_rows:
+                tree.insert("", tk.END, values=row[1])
+        
+        def sort_by(index):
+            # Clicking the same heading again reverses the order
+            order[index] = not order.get(index, index in numeric)
+            fill(sorted(rows, key=lambda row: row[0][index], reverse=order[index]))
+        
+        for index, (name, width) in enumerate(columns):
+            tree.heading(name, text=name, command=lambda index=index: sort_by(index))
+            tree.column(name, width=width, stretch=index == 0,
+                        anchor=tk.E if index in numeric else tk.W)
+        
+        fill(rows)
+        return window
+    
+    def show_profile(self):
+        """Show the hot functions of the selected job's profile"""
+        job = self.selected_job()
+        if job is None or not job.profile_stats:
+            return
+        
+        # Each row keeps the raw values for sorting and the formatted ones for display
+        rows = [((label, ncalls, tottime, cumtime, percall),
+                 (label, ncalls, f"{tottime:.4f}", f"{cumtime:.4f}", f"{percall * 1e6:.1f}"))
+                for label, ncalls, tottime, cumtime, percall in profile_rows(job.profile_stats)]
+        window = self.show_table(f"Profile of job {job.id}: {job.util_name}.{job.func_name}",
+                                 (("Function", 420), ("Calls", 80), ("Own (s)", 90),
+                                  ("Cumulative (s)", 110), ("Own per call (µs)", 130)),
+                                 rows, numeric=(1, 2, 3, 4))
+        
+        def export():
+            path = filedialog.asksaveasfilename(parent=window, defaultextension=".prof",
+                                                filetypes=[("Profile", "*.prof"), ("All files", "*.*")],
+                                                initialfile=f"{job.func_name}_{job.id}.prof")
+            if path:
+                try:
+                    dump_profile(job.profile_stats, path)
+                except OSError as e:
+                    messagebox.showerror("Error", f"Could not write profile: {str(e)}", parent=window)
+        
+        ttk.Button(window, text="Export .prof", command=export).pack(pady=(0, 5))
+    
+    def show_function_history(self):
+        """Show the recorded runs of the selected function"""
+        if not self.current_func:
+            messagebox.showwarning("Warning", "No function selected")
+            return
+        
+        runs = load_history(self.history_path, self.current_util_name, self.current_func_name)
+        if not runs:
+            messagebox.showinfo("No History", "This function has not been run yet.")
+            return
+        
+        rows = []
+        for run in reversed(runs):
+            cpu = run.get('cpu')
+            peak = run.get('peak_memory')
+            raw = (run.get('time', ""), run.get('version') or "", run.get('mode', ""), run.get('status', DONE),
+                   run['wall'], cpu if cpu is not None else -1, peak if peak is not None else -1,
+                   run.get('output_lines', 0))
+            shown = (raw[0], raw[1][:8], raw[2], raw[3], f"{run['wall']:.3f}",
+                     f"{cpu:.3f}" if cpu is not None else "",
+                     format_bytes(peak) if peak is not None else "", raw[7])
+            rows.append((raw, shown))
+        
+        window = self.show_table(f"History of {self.current_util_name}.{self.current_func_name}",
+                                 (("Time", 160), ("Version", 80), ("Mode", 70), ("Status", 70), ("Wall (s)", 80),
+                                  ("CPU (s)", 80), ("Peak Mem", 90), ("Lines", 70)),
+                                 rows, numeric=(4, 5, 6, 7))
+        
+        # Median wall time of completed runs per module version, oldest first,
+        # to spot regressions; cached and failed runs would skew it
+        versions = {}
+        for run in runs:
+            if run.get('status', DONE) == DONE:
+                versions.setdefault(run.get('version') or "", []).append(run['wall'])
+        summary = "   ".join(f"{version[:8] or '?'}: {statistics.median(walls):.3f}s median ({len(walls)} runs)"
+                               for version, walls in versions.items())
+        ttk.Label(window, text=summary, wraplength=880).pack(anchor=tk.W, padx=5, pady=(0, 5))
+    
+    def cancel_execution(self):
+        """Cancel the selected job"""
+        job = self.selected_job()
+        if job is not None and self.job_queue.cancel(job):
+            self.cancel_button.config(state=tk.DISABLED)
+    
+    def clear_finished_jobs(self):
+        """Remove finished jobs from the jobs panel"""
+        for job in self.job_queue.remove_finished():
+            if self.console_sink.output is job.output:
+                self.console_sink.attach(self.hub_output)
+            self.jobs_tree.delete(str(job.id))
+            del self.jobs[str(job.id)]
+        self.update_cancel_button()
+    
+    def clear_cache(self):
+        """Drop all cached results, including the on-disk store"""
+        self.result_cache.clear()
+        self.log("Result cache cleared.")
+    
+    def on_close(self):
+        """Stop jobs and worker processes and close the window"""
+        self.job_queue.shutdown()
+        self.process_backend.shutdown()
+        uninstall_router()
+        self.hub_output.discard()
+        self.root.destroy()
+    
+    def open_full_output(self):
+        """Open the complete output of the selected job with the default application"""
+        output = self.console_sink.output
+        path = output.spill_path if output is not None else None
+        if not path or not os.path.exists(path):
+            messagebox.showinfo("No Output", "There is no output to open yet.")
+            return
+        
+        output.flush()
+        try:
+            if sys.platform == 'win32':
+                os.startfile(path)
+            elif sys.platform == 'darwin':
+                os.system(f'open "{path}"')
+            else:
+                os.system(f'xdg-open "{path}"')
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not open output file: {str(e)}")
         
 def main():
     root = tk.Tk()
@@ -0,0 +1,193 @@
+"""Headless batch runner for Utility Hub functions.
+
+Runs one utility function for every parameter set in a JSONL file, in
+parallel on a thread or process pool, without a display. Utilities are
+discovered and parameters converted exactly as in the hub window. Every call
+is written as one JSON line with its parameters, result or error, and timing.
+
+Example:
+    python hub_batch.py util_converter celsius_to_fahrenheit params.jsonl -o results.jsonl
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import inspect
+import argparse
+import concurrent.futures
+
+from hub_discovery import discover_utilities, load_module, coerce_params
+from hub_jobs import capture_output
+from hub_cache import ResultCache
+
+# Calls in flight per worker; bounds memory for very large parameter files
+_IN_FLIGHT_PER_WORKER = 4
+
+def _call(module_name, path, func_name, params, keep_output):
+    """
+    Execute one call and return (ok, result or error, output, seconds).
+    
+    Runs in pool threads and worker processes. Generators are consumed into
+    a list. Output printed by the function is captured per call.
+    """
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with capture_output(output):
+            func = getattr(load_module(module_name, path), func_name)
+            result = func(**params)
+            if inspect.isgenerator(result):
+                result = list(result)
+        ok = True
+    except Exception as e:
+        ok, result = False, f"{type(e).__name__}: {str(e)}"
+    seconds = time.perf_counter() - start
+    return ok, result, output.getvalue() if keep_output else None, seconds
+
+def _read_param_sets(params_file):
+    """Yield (line number, parameters, error message) for each non-empty line."""
+    with open(params_file, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                values = json.loads(line)
+            except ValueError as e:
+                yield line_no, None, f"Invalid JSON: {str(e)}"
+                continue
+            if not isinstance(values, dict):
+                yield line_no, None, "Parameter set must be a JSON object"
+                continue
+            yield line_no, values, None
+
+def _record(line_no, values, ok, result, output, seconds):
+    record = {'line': line_no, 'params': values, 'ok': ok}
+    record['result' if ok else 'error'] = result
+    record['seconds'] = round(seconds, 6)
+    if output is not None:
+        record['output'] = output
+    return record
+
+def run_batch(util_name, func_name, params_file, output_file=None, workers=0, processes=False,
+              keep_output=False, utilities_dir=None, cache=False):
+    """
+    Run a utility function for every parameter set of a JSONL file.
+    
+    Args:
+        util_name (str): Utility module name, e.g. 'util_converter'
+        func_name (str): Function name in the module
+        params_file (str): JSONL file with one JSON object of parameters per line
+        output_file (str, optional): JSONL result file; stdout when omitted
+        workers (int): Pool size; 0 uses the number of CPUs
+        processes (bool): Use a process pool instead of a thread pool
+        keep_output (bool): Include the printed output of every call
+        utilities_dir (str, optional): Directory of the utility modules
+        cache (bool): Reuse results of functions marked pure from the on-disk
+                      result cache and store new ones there
+    
+    Returns:
+        dict: Summary with 'calls', 'errors', 'cached' and 'seconds'
+    """
+    utilities_dir = utilities_dir or os.path.dirname(os.path.abspath(__file__))
+    utilities = discover_utilities(utilities_dir)
+    if util_name not in utilities:
+        raise ValueError(f"Unknown utility '{util_name}'")
+    utility = utilities[util_name]
+    if func_name not in utility['functions']:
+        raise ValueError(f"Unknown function '{func_name}' in {util_name}")
+    function = utility['functions'][func_name]
+    
+    workers = workers or os.cpu_count() or 1
+    executor_class = (concurrent.futures.ProcessPoolExecutor if processes
+                      else concurrent.futures.ThreadPoolExecutor)
+    
+    result_cache = ResultCache(persistent=True) if cache else None
+    
+    start = time.perf_counter()
+    calls = errors = cached = 0
+    out = open(output_file, 'w', encoding='utf-8') if output_file else sys.stdout
+    
+    def write(record):
+        nonlocal calls, errors
+        calls += 1
+        errors += not record['ok']
+        out.write(json.dumps(record, ensure_ascii=False, default=repr) + "\n")
+    
+    def finish(future, line_no, values, cache_key):
+        ok, result, output, seconds = future.result()
+        if ok and cache_key:
+            result_cache.put(cache_key, result, output)
+        write(_record(line_no, values, ok, result, output if keep_output else None, seconds))
+    
+    try:
+        with executor_class(max_workers=workers) as executor:
+            pending = {}
+            for line_no, values, error in _read_param_sets(params_file):
+                if error is None:
+                    try:
+                        params = coerce_params(function, values)
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    write(_record(line_no, values, False, error, None, 0.0))
+                    continue
+                
+                cache_key = None
+                if result_cache is not None:
+                    cache_key = result_cache.make_key(utility['hash'], func_name, function, params, "batch")
+                    hit = result_cache.get(cache_key) if cache_key else None
+                    if hit is not None:
+                        record = _record(line_no, values, True, hit[0], hit[1] if keep_output else None, 0.0)
+                        record['cached'] = True
+                        cached += 1
+                        write(record)
+                        continue
+                
+                # Output is needed for the cache even if it is not written
+                future = executor.submit(_call, util_name, utility['path'], func_name, params,
+                                         keep_output or cache_key is not None)
+                pending[future] = (line_no, values, cache_key)
+                
+                # Write finished calls as they complete to keep the window bounded
+                if len(pending) >= workers * _IN_FLIGHT_PER_WORKER:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        finish(future, *pending.pop(future))
+            
+            for future in concurrent.futures.as_completed(pending):
+                finish(future, *pending[future])
+    finally:
+        if output_file:
+            out.close()
+    
+    return {'calls': calls, 'errors': errors, 'cached': cached, 'seconds': time.perf_counter() - start}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a Utility Hub function for every parameter set of a JSONL file.")
+    parser.add_argument("utility", help="Utility module name, e.g. util_converter")
+    parser.add_argument("function", help="Function name, e.g. celsius_to_fahrenheit")
+    parser.add_argument("params", help="JSONL file with one JSON object of parameters per line")
+    parser.add_argument("-o", "--output", help="JSONL result file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="Number of workers (default: CPU count)")
+    parser.add_argument("-p", "--processes", action="store_true", help="Use worker processes instead of threads")
+    parser.add_argument("--keep-output", action="store_true", help="Include the printed output of every call")
+    parser.add_argument("--utilities-dir", help="Directory with the utility modules (default: this directory)")
+    parser.add_argument("--cache", action="store_true", help="Reuse cached results of pure functions (stored on disk)")
+    args = parser.parse_args(argv)
+    
+    try:
+        summary = run_batch(args.utility, args.function, args.params, args.output, args.workers,
+                            args.processes, args.keep_output, args.utilities_dir, args.cache)
+    except (OSError, ValueError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+    
+    rate = summary['calls'] / summary['seconds'] if summary['seconds'] else 0
+    print(f"{summary['calls']} calls ({summary['cached']} cached), {summary['errors']} errors "
+          f"in {summary['seconds']:.2f}s ({rate:.0f} calls/s)", file=sys.stderr)
+    return 1 if summary['errors'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""Result cache for pure utility functions.
+
+Utility modules mark functions whose result only depends on their arguments
+with __pure__ (see hub_discovery.parse_module). Results of such functions
+are kept in a bounded in-memory LRU and optionally in a store of pickle
+files on disk, together with the output the call printed so a cache hit can
+replay it. Keys combine the module's content hash, the function name and
+the arguments; for parameters listed in __file_params__ the file's size and
+modification time are part of the key, so a changed file is a cache miss.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import threading
+import collections
+
+# Number of results kept in memory
+CACHE_MAX_ENTRIES = 256
+
+# Number of result files kept on disk; older ones are removed
+CACHE_MAX_DISK_ENTRIES = 10000
+
+# Calls that print more than this many characters are not cached
+CACHE_MAX_OUTPUT = 1024 * 1024
+
+# Default location of the on-disk store
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".utility_hub", "result_cache")
+
+# The disk store is pruned after this many writes
+_PRUNE_INTERVAL = 256
+
+def _file_stamp(path):
+    """Return (absolute path, mtime_ns, size) of a file, None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+class OutputRecorder:
+    """File-like wrapper that passes output on and records it for the cache."""
+    
+    def __init__(self, output, limit=CACHE_MAX_OUTPUT):
+        self.output = output
+        self.limit = limit
+        self.parts = []
+        self.size = 0
+        self.overflow = False
+    
+    def write(self, text):
+        if not self.overflow:
+            self.size += len(text)
+            if self.size > self.limit:
+                self.overflow = True
+                self.parts = []
+            else:
+                self.parts.append(text)
+        return self.output.write(text)
+    
+    def flush(self):
+        self.output.flush()
+    
+    def getvalue(self):
+        return None if self.overflow else "".join(self.parts)
+
+class ResultCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, disk_dir=DEFAULT_CACHE_DIR, persistent=False,
+                 max_disk_entries=CACHE_MAX_DISK_ENTRIES):
+        """
+        Create a result cache.
+        
+        Args:
+            max_entries (int): Number of results kept in memory
+            disk_dir (str): Directory of the on-disk store
+            persistent (bool): Whether results are also read from and written
+                               to the on-disk store (can be changed at any time)
+            max_disk_entries (int): Number of results kept on disk
+        """
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.persistent = persistent
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+    
+    def make_key(self, module_hash, func_name, function, params, namespace=""):
+        """
+        Return the cache key of a call, or None if it must not be cached.
+        
+        Args:
+            module_hash (str): Content hash of the utility module
+            func_name (str): Function name
+            function (dict): Function metadata from discover_utilities
+            params (dict): Keyword arguments of the call
+            namespace (str): Separates callers that report results differently
+        """
+        if not function.get('pure'):
+            return None
+        
+        files = {}
+        for name in function.get('file_params', ()):
+            if name in params:
+                stamp = _file_stamp(params[name])
+                if stamp is None:
+                    return None
+                files[name] = stamp
+        
+        try:
+            text = json.dumps([namespace, module_hash, func_name, params, files], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pickle")
+    
+    def get(self, key):
+        """Return (result, output) for a key, or None on a miss."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+        
+        if data is None and self.persistent:
+            try:
+                with open(self._disk_path(key), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                data = None
+            if data is not None:
+                self._remember(key, data)
+        
+        # Entries are kept pickled, so callers get their own copy of the result
+        entry = None
+        if data is not None:
+            try:
+                entry = pickle.loads(data)
+            except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+                entry = None
+        
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+    
+    def put(self, key, result, output):
+        """Store the result and printed output of a call; unpicklable results are skipped."""
+        if key is None or output is None:
+            return
+        try:
+            data = pickle.dumps((result, output), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        
+        self._remember(key, data)
+        if self.persistent:
+            self._write_disk(key, data)
+    
+    def _remember(self, key, data):
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def _write_disk(self, key, data):
+        """Write an entry atomically; failures only cost a recomputation."""
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % _PRUNE_INTERVAL == 0
+        if prune:
+            self.prune_disk()
+    
+    def prune_disk(self):
+        """Remove the least recently written entries beyond max_disk_entries."""
+        if not os.path.isdir(self.disk_dir):
+            return
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    entries.append((os.stat(path).st_mtime_ns, path))
+                except OSError:
+                    pass
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def clear(self):
+        """Drop all cached results, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+        if os.path.isdir(self.disk_dir):
+            for root, _, files in os.walk(self.disk_dir):
+                for name in files:
+                    if name.endswith(".pickle"):
+                        try:
+                            os.remove(os.path.join(root, name))
+                        except OSError:
+                            pass
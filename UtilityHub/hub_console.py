@@ -0,0 +1,159 @@
+"""Buffered output console for the Utility Hub.
+
+Utility functions print from worker threads, often many thousands of lines.
+Each run writes into its own JobOutput, which keeps the last lines in memory
+and spills the complete output to a temporary file. ConsoleSink shows one
+JobOutput at a time: the Tk main loop flushes new output to the console
+widget in batches on a timer and trims the widget to the last lines (a ring
+buffer).
+"""
+
+import os
+import threading
+import tempfile
+import collections
+import tkinter as tk
+
+# Number of lines kept in the console widget
+CONSOLE_MAX_LINES = 5000
+
+# Interval in milliseconds at which buffered output is flushed to the widget
+CONSOLE_FLUSH_MS = 100
+
+class JobOutput:
+    def __init__(self, tail_lines=CONSOLE_MAX_LINES):
+        """
+        Create an output buffer for one run.
+        
+        Args:
+            tail_lines (int): Approximate number of trailing lines kept in memory
+        """
+        self.tail_lines = tail_lines
+        self.spill_path = None
+        self.characters_written = 0
+        self.lines_written = 0
+        self._lock = threading.Lock()
+        self._tail = collections.deque()
+        self._tail_line_count = 0
+        self._pending = []
+        self._watched = False
+        self._spill = None
+        self._discarded = False
+    
+    def write(self, text):
+        """Buffer output and append it to the spill file. Safe from any thread."""
+        if not text:
+            return
+        newlines = text.count("\n")
+        with self._lock:
+            if self._spill is None and not self._discarded:
+                self._spill = tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.log',
+                                                          prefix='utility_hub_', delete=False)
+                self.spill_path = self._spill.name
+            if self._spill is not None:
+                self._spill.write(text)
+            self.characters_written += len(text)
+            self.lines_written += newlines
+            
+            self._tail.append(text)
+            self._tail_line_count += newlines
+            while self._tail_line_count > self.tail_lines and len(self._tail) > 1:
+                self._tail_line_count -= self._tail.popleft().count("\n")
+            
+            if self._watched:
+                self._pending.append(text)
+    
+    def flush(self):
+        """Flush the spill file so it can be opened while output is written."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.flush()
+    
+    def close(self):
+        """Finish the output; the spill file stays available."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+    
+    def discard(self):
+        """Close and delete the spill file; later output is only kept in memory."""
+        with self._lock:
+            self._discarded = True
+        self.close()
+        if self.spill_path:
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+    
+    def watch(self):
+        """Start collecting output for a viewer and return the current tail."""
+        with self._lock:
+            self._watched = True
+            self._pending = []
+            return "".join(self._tail)
+    
+    def unwatch(self):
+        with self._lock:
+            self._watched = False
+            self._pending = []
+    
+    def take_pending(self):
+        """Return the output written since the last call (for the viewer)."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return "".join(pending)
+
+class ConsoleSink:
+    def __init__(self, widget, max_lines=CONSOLE_MAX_LINES, flush_ms=CONSOLE_FLUSH_MS):
+        """
+        Create a sink that shows a JobOutput in the given Text widget.
+        
+        Args:
+            widget: The tk.Text (or ScrolledText) widget to write to
+            max_lines (int): Maximum number of lines kept in the widget
+            flush_ms (int): Flush interval in milliseconds
+        """
+        self.widget = widget
+        self.max_lines = max_lines
+        self.flush_ms = flush_ms
+        self.output = None
+        self.widget.after(self.flush_ms, self._flush_to_widget)
+    
+    def attach(self, output):
+        """Show output in the widget, starting with its retained tail (main thread only)."""
+        if self.output is output:
+            return
+        if self.output is not None:
+            self.output.unwatch()
+        self.output = output
+        self.widget.delete(1.0, tk.END)
+        if output is not None:
+            self._insert(output.watch())
+    
+    def _insert(self, text):
+        if not text:
+            return
+        
+        # Only the tail can survive trimming, so skip inserting the rest
+        if text.count("\n") > self.max_lines:
+            text = "\n".join(text.split("\n")[-self.max_lines - 1:])
+        
+        self.widget.insert(tk.END, text)
+        
+        line_count = int(self.widget.index('end-1c').split('.')[0])
+        if line_count > self.max_lines:
+            self.widget.delete(1.0, f"{line_count - self.max_lines + 1}.0")
+        self.widget.see(tk.END)
+    
+    def _flush_to_widget(self):
+        """Move new output to the widget and trim it (runs on the main loop)."""
+        try:
+            if self.output is not None:
+                self._insert(self.output.take_pending())
+        finally:
+            try:
+                self.widget.after(self.flush_ms, self._flush_to_widget)
+            except tk.TclError:
+                pass  # The window has been destroyed
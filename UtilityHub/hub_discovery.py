@@ -0,0 +1,259 @@
+"""Utility module discovery for the Utility Hub.
+
+Utility modules are not imported to find out what they offer. Their module
+docstring, public functions and signatures are read statically from the
+source with the ast module and cached on disk, keyed by file modification
+time, size and content hash. A module is only imported when one of its
+functions is executed for the first time.
+"""
+
+import os
+import sys
+import ast
+import json
+import hashlib
+import threading
+import importlib.util
+
+# Bump when the layout of the cached metadata changes
+CACHE_VERSION = 3
+
+# Cache file, relative to the utility directory
+CACHE_FILE = os.path.join("__pycache__", "hub_metadata.json")
+
+_import_lock = threading.Lock()
+
+def _file_hash(path):
+    """Return the SHA-1 hex digest of a file's content."""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _describe_parameter(arg, default, constants):
+    """
+    Return the metadata of one function parameter.
+    
+    Defaults that name a literal module constant are resolved. Other
+    non-literal defaults have 'default' None and 'literal_default' False;
+    the hub leaves such a parameter empty and omits it when it stays empty.
+    """
+    param = {
+        'name': arg.arg,
+        'annotation': ast.unparse(arg.annotation) if arg.annotation is not None else None,
+        'has_default': default is not None,
+        'default': None,
+        'literal_default': True,
+    }
+    if default is not None:
+        if isinstance(default, ast.Name) and default.id in constants:
+            param['default'] = str(constants[default.id])
+        else:
+            try:
+                param['default'] = str(ast.literal_eval(default))
+            except (ValueError, TypeError, SyntaxError):
+                param['literal_default'] = False
+    return param
+
+def _describe_function(node, constants):
+    """Return the metadata of a function definition."""
+    args = node.args
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    
+    params = [_describe_parameter(arg, default, constants) for arg, default in zip(positional, defaults)]
+    params += [_describe_parameter(arg, default, constants)
+               for arg, default in zip(args.kwonlyargs, args.kw_defaults)]
+    
+    return {
+        'doc': ast.get_docstring(node) or "",
+        'params': params,
+    }
+
+def _module_constants(tree, names=None):
+    """Return the literal values of module-level assignments to the given names (default: all)."""
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                and isinstance(node.targets[0], ast.Name) and (names is None or node.targets[0].id in names):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except (ValueError, TypeError, SyntaxError):
+                pass
+    return constants
+
+def parse_module(path):
+    """
+    Read a utility module's metadata from its source without importing it.
+    
+    A module marks functions whose results may be cached with __pure__
+    (True for all functions, or a tuple of names) and names parameters that
+    are file paths with __file_params__ ({function: (parameter, ...)}).
+    
+    Returns:
+        dict: 'description' and 'functions' ({name: {'doc', 'params', 'pure',
+              'file_params'}}) for all public top-level functions, sorted by name
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    
+    constants = _module_constants(tree)
+    functions = {node.name: _describe_function(node, constants)
+                 for node in tree.body
+                 if isinstance(node, ast.FunctionDef) and not node.name.startswith('_')}
+    
+    pure = constants.get('__pure__', ())
+    file_params = constants.get('__file_params__', {})
+    for name, function in functions.items():
+        function['pure'] = pure is True or (isinstance(pure, (tuple, list)) and name in pure)
+        function['file_params'] = list(file_params.get(name, ())) if isinstance(file_params, dict) else []
+    
+    return {
+        'description': ast.get_docstring(tree) or "No description available",
+        'functions': dict(sorted(functions.items())),
+    }
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_VERSION:
+            return cache['modules']
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+def _save_cache(cache_path, modules):
+    """Write the cache atomically; failures only cost a re-parse next time."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'modules': modules}, f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+def discover_utilities(directory, errors=None):
+    """
+    Find all util*.py modules in a directory and return their metadata.
+    
+    Args:
+        directory (str): Directory containing the utility modules
+        errors (list, optional): Receives (file name, message) for modules that
+                                 could not be parsed
+    
+    Returns:
+        dict: {module_name: {'path', 'hash', 'description', 'functions'}}
+    """
+    cache_path = os.path.join(directory, CACHE_FILE)
+    cached = _load_cache(cache_path)
+    modules = {}
+    changed = False
+    
+    util_files = sorted(f for f in os.listdir(directory)
+                        if f.startswith("util") and f.endswith(".py"))
+    
+    for file in util_files:
+        path = os.path.join(directory, file)
+        try:
+            stat = os.stat(path)
+            entry = cached.get(file)
+            
+            if not entry or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                file_hash = _file_hash(path)
+                if not entry or entry['hash'] != file_hash:
+                    entry = {'hash': file_hash, 'metadata': parse_module(path)}
+                entry['mtime_ns'] = stat.st_mtime_ns
+                entry['size'] = stat.st_size
+                changed = True
+            
+            modules[file] = entry
+        except (OSError, SyntaxError, ValueError) as e:
+            if errors is not None:
+                errors.append((file, str(e)))
+    
+    if changed or modules.keys() != cached.keys():
+        _save_cache(cache_path, modules)
+    
+    return {
+        os.path.splitext(file)[0]: {
+            'path': os.path.join(directory, file),
+            'hash': entry['hash'],
+            'description': entry['metadata']['description'],
+            'functions': entry['metadata']['functions'],
+        }
+        for file, entry in modules.items()
+    }
+
+def _coerce_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+# Conversions for the parameter annotations the hub understands
+_COERCIONS = {
+    'int': (int, "an integer"),
+    'float': (float, "a float"),
+    'bool': (_coerce_bool, "a boolean"),
+}
+
+def coerce_params(function, values):
+    """
+    Convert raw parameter values to the types of a function's annotations.
+    
+    Values come from input widgets or JSON and may be strings; parameters
+    annotated int, float or bool are converted, all others are passed on
+    unchanged. Parameters that are not given keep the function's default,
+    as do empty values of parameters whose default is not a literal.
+    
+    Args:
+        function (dict): Function metadata as returned by discover_utilities
+        values (dict): {parameter name: raw value}
+    
+    Returns:
+        dict: Keyword arguments for the function
+    
+    Raises:
+        ValueError: For unknown parameters and values that cannot be converted
+    """
+    annotations = {param['name']: param['annotation'] for param in function['params']}
+    computed_defaults = {param['name'] for param in function['params']
+                         if param['has_default'] and not param.get('literal_default', True)}
+    params = {}
+    for name, value in values.items():
+        if name not in annotations:
+            raise ValueError(f"Unknown parameter '{name}'")
+        if name in computed_defaults and value == "":
+            continue
+        
+        conversion = _COERCIONS.get(annotations[name])
+        if conversion is not None:
+            convert, description = conversion
+            try:
+                value = convert(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Parameter '{name}' must be {description}") from None
+        
+        params[name] = value
+    return params
+
+def load_module(module_name, path):
+    """
+    Import a utility module (once) and return it.
+    
+    The module is registered in sys.modules so that process pool workers
+    can pickle its functions.
+    """
+    with _import_lock:
+        module = sys.modules.get(module_name)
+        if module is not None and os.path.abspath(getattr(module, '__file__', '')) == os.path.abspath(path):
+            return module
+        
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+        return module
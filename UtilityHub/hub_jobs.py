@@ -0,0 +1,306 @@
+"""Concurrent job queue for the Utility Hub.
+
+Every execution becomes a Job that runs on a thread pool with a configurable
+concurrency limit. Output is captured per job: sys.stdout is replaced once by
+a router that writes to the JobOutput of the job running in the current
+context (a contextvars.ContextVar), so concurrent jobs never share the
+console and no global stdout swapping happens per run. Every run is measured
+(see hub_metrics) and appended to the run history with its status.
+"""
+
+import sys
+import time
+import datetime
+import itertools
+import threading
+import contextlib
+import contextvars
+import concurrent.futures
+
+from hub_cache import OutputRecorder
+from hub_console import JobOutput
+from hub_metrics import measure_call, append_history
+from hub_workers import run_and_report, ExecutionCancelled, ExecutionTimeout
+
+# Default number of jobs that run at the same time
+DEFAULT_CONCURRENCY = 2
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_current_output = contextvars.ContextVar("hub_job_output", default=None)
+
+class OutputRouter:
+    """stdout replacement that routes writes to the current job's output."""
+    
+    def __init__(self, fallback):
+        self.fallback = fallback
+    
+    def write(self, text):
+        output = _current_output.get()
+        if output is None:
+            return self.fallback.write(text) if self.fallback is not None else len(text)
+        output.write(text)
+        return len(text)
+    
+    def flush(self):
+        output = _current_output.get()
+        if output is None:
+            if self.fallback is not None:
+                self.fallback.flush()
+        else:
+            output.flush()
+
+@contextlib.contextmanager
+def capture_output(output):
+    """
+    Route print() output of the current context to output while active.
+    
+    Unlike contextlib.redirect_stdout this only affects the current thread
+    (context), so concurrent calls can capture their output separately.
+    The router must be installed, which this does if necessary.
+    """
+    install_router()
+    token = _current_output.set(output)
+    try:
+        yield output
+    finally:
+        _current_output.reset(token)
+
+def install_router():
+    """Install the output router as sys.stdout (once) and return it."""
+    if not isinstance(sys.stdout, OutputRouter):
+        sys.stdout = OutputRouter(sys.stdout)
+    return sys.stdout
+
+def uninstall_router():
+    """Restore the stdout that was active before install_router()."""
+    if isinstance(sys.stdout, OutputRouter):
+        sys.stdout = sys.stdout.fallback
+
+class Job:
+    _ids = itertools.count(1)
+    
+    def __init__(self, util_name, func_name, params, use_process=False, timeout=None, cache_key=None,
+                 module_hash=None, profile=False, trace_memory=False):
+        self.id = next(Job._ids)
+        self.util_name = util_name
+        self.func_name = func_name
+        self.params = params
+        self.use_process = use_process
+        self.timeout = timeout
+        self.cache_key = cache_key
+        self.cached = False
+        self.module_hash = module_hash
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.metrics = None
+        self.profile_stats = None
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.output = JobOutput()
+        self.cancel_event = threading.Event()
+        self.future = None
+    
+    @property
+    def elapsed(self):
+        """Seconds the job has been running (or ran), None while queued."""
+        if self.started is None:
+            return None
+        return (self.finished or time.monotonic()) - self.started
+    
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+    
+    @property
+    def cancellable(self):
+        """Queued jobs and jobs running in a worker process can be cancelled."""
+        return self.status == QUEUED or (self.status == RUNNING and self.use_process)
+
+class JobQueue:
+    def __init__(self, resolve, process_backend, concurrency=DEFAULT_CONCURRENCY, on_change=None,
+                 result_cache=None, history_path=None):
+        """
+        Create a job queue.
+        
+        Args:
+            resolve: Callable (util_name, func_name) -> function, used for thread jobs
+            process_backend: ProcessBackend running process jobs
+            concurrency (int): Maximum number of jobs running at the same time
+            on_change: Called with the job whenever its state changes (from any thread)
+            result_cache (ResultCache, optional): Cache for jobs submitted with a cache key
+            history_path (str, optional): JSON-lines file the metrics and status of
+                                          finished runs are appended to
+        """
+        self.resolve = resolve
+        self.process_backend = process_backend
+        self.result_cache = result_cache
+        self.history_path = history_path
+        self.on_change = on_change
+        self.jobs = []
+        self._lock = threading.Lock()
+        self._executor = None
+        self.set_concurrency(concurrency)
+    
+    def set_concurrency(self, concurrency):
+        """
+        Change the concurrency limit for jobs submitted from now on.
+        
+        Jobs already queued keep running under the previous limit.
+        """
+        concurrency = max(1, int(concurrency))
+        with self._lock:
+            if self._executor is not None and concurrency == self.concurrency:
+                return
+            self.concurrency = concurrency
+            old, self._executor = self._executor, concurrent.futures.ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="hub-job")
+        # One idle worker process per job slot
+        self.process_backend.pool_size = concurrency
+        if old is not None:
+            old.shutdown(wait=False)
+    
+    def submit(self, util_name, path, func_name, params, use_process=False, timeout=None, cache_key=None,
+               module_hash=None, profile=False, trace_memory=False):
+        """
+        Queue a utility function call and return its Job.
+        
+        With a cache_key (see ResultCache.make_key) a cached result is used
+        and its output replayed instead of running the function. The module
+        hash identifies the module version in the run history; profile and
+        trace_memory are passed to measure_call.
+        """
+        if self.result_cache is None:
+            cache_key = None
+        job = Job(util_name, func_name, params, use_process, timeout, cache_key,
+                  module_hash, profile, trace_memory)
+        with self._lock:
+            self.jobs.append(job)
+            job.future = self._executor.submit(self._run, job, path)
+        self._notify(job)
+        return job
+    
+    def cancel(self, job):
+        """
+        Cancel a job if possible.
+        
+        Returns:
+            bool: Whether the job was (or will be) cancelled
+        """
+        if job.status == QUEUED and job.future.cancel():
+            job.status = CANCELLED
+            job.output.write("Execution cancelled before it started.\n")
+            job.output.close()
+            self._notify(job)
+            return True
+        if job.cancellable:
+            job.cancel_event.set()
+            return True
+        return False
+    
+    def remove_finished(self):
+        """Forget finished jobs and delete their output files."""
+        with self._lock:
+            finished = [job for job in self.jobs if not job.active]
+            self.jobs = [job for job in self.jobs if job.active]
+        for job in finished:
+            job.output.discard()
+        return finished
+    
+    def shutdown(self):
+        """Cancel all jobs, stop the pool without waiting and delete all output files."""
+        with self._lock:
+            jobs = list(self.jobs)
+            executor = self._executor
+        for job in jobs:
+            if job.active:
+                self.cancel(job)
+        executor.shutdown(wait=False, cancel_futures=True)
+        for job in jobs:
+            job.output.discard()
+    
+    def _notify(self, job):
+        if self.on_change is not None:
+            self.on_change(job)
+    
+    def _record_history(self, job):
+        if self.history_path is None:
+            return
+        append_history(self.history_path, dict(
+            job.metrics,
+            time=datetime.datetime.now().isoformat(timespec='seconds'),
+            module=job.util_name,
+            function=job.func_name,
+            version=job.module_hash,
+            mode="process" if job.use_process else "thread",
+            status="cached" if job.cached else job.status,
+        ))
+    
+    def _run(self, job, path):
+        if job.cancel_event.is_set():
+            job.status = CANCELLED
+            job.output.close()
+            self._notify(job)
+            return
+        
+        job.started = time.monotonic()
+        job.status = RUNNING
+        self._notify(job)
+        
+        # Output of cacheable jobs is recorded so a later hit can replay it
+        output = OutputRecorder(job.output) if job.cache_key else job.output
+        with capture_output(output):
+            try:
+                cached = self.result_cache.get(job.cache_key) if job.cache_key else None
+                if cached is not None:
+                    job.result, replay = cached
+                    job.cached = True
+                    print(replay, end="")
+                    print("\nExecution completed (cached result).")
+                    job.status = DONE
+                    return
+                
+                if job.use_process:
+                    job.result, metrics, job.profile_stats = self.process_backend.run(
+                        job.util_name, path, job.func_name, job.params, output, job.timeout,
+                        job.cancel_event, job.profile, job.trace_memory)
+                else:
+                    func = self.resolve(job.util_name, job.func_name)
+                    job.result, metrics, job.profile_stats = measure_call(
+                        lambda: run_and_report(func, job.params), job.profile, job.trace_memory)
+                
+                job.metrics = dict(metrics, output_chars=job.output.characters_written,
+                                   output_lines=job.output.lines_written)
+                
+                if job.cache_key:
+                    self.result_cache.put(job.cache_key, job.result, output.getvalue())
+                
+                print("\nExecution completed.")
+                job.status = DONE
+            except (ExecutionCancelled, ExecutionTimeout) as e:
+                print(f"\n{str(e)}.")
+                job.error = str(e)
+                job.status = CANCELLED if isinstance(e, ExecutionCancelled) else FAILED
+            except Exception as e:
+                print(f"\nError during execution: {str(e)}")
+                job.error = str(e)
+                job.status = FAILED
+            finally:
+                job.finished = time.monotonic()
+                if job.metrics is None:
+                    # Cached, failed and cancelled runs only have their wall time
+                    job.metrics = {'wall': job.finished - job.started, 'cpu': None, 'peak_memory': None,
+                                   'output_chars': job.output.characters_written,
+                                   'output_lines': job.output.lines_written}
+                self._record_history(job)
+                job.output.close()
+                self._notify(job)
@@ -0,0 +1,152 @@
+"""Run metrics and profiling for the Utility Hub.
+
+measure_call() records the wall and CPU time of a call and, on request, the
+peak memory traced by tracemalloc and a cProfile profile. The metrics of
+every run are appended to a JSON-lines history file so runs of a function
+can be compared across versions of its module.
+"""
+
+import os
+import json
+import time
+import marshal
+import cProfile
+import threading
+import tracemalloc
+
+# Number of runs per function read back from the history
+HISTORY_LIMIT = 1000
+
+# tracemalloc is process-wide: it runs while at least one call traces memory.
+# Starting a call resets the traced peak, so the peak reached until then is
+# kept for every call already tracing ({token: peak}).
+_trace_lock = threading.Lock()
+_trace_peaks = {}
+
+# Only one profiler can be active at a time
+_profile_lock = threading.Lock()
+
+def _start_tracing():
+    """Start tracing for one call and return its token for _stop_tracing."""
+    with _trace_lock:
+        if not _trace_peaks:
+            tracemalloc.start()
+        else:
+            peak = tracemalloc.get_traced_memory()[1]
+            for token, previous in _trace_peaks.items():
+                _trace_peaks[token] = max(previous, peak)
+            tracemalloc.reset_peak()
+        token = object()
+        _trace_peaks[token] = 0
+        return token
+
+def _stop_tracing(token):
+    """Return the peak traced during a call in bytes and stop tracing with the last call."""
+    with _trace_lock:
+        peak = max(_trace_peaks.pop(token), tracemalloc.get_traced_memory()[1])
+        if not _trace_peaks:
+            tracemalloc.stop()
+        return peak
+
+def process_cpu_time():
+    """Return the CPU time of this process and of its child processes that have exited."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+def measure_call(func, profile=False, trace_memory=False, cpu_clock=time.thread_time):
+    """
+    Call func() and measure it.
+
+    CPU time is that of the calling thread by default, so work the call
+    hands to other threads or processes is not included; a call that runs
+    alone in a process can pass cpu_clock=process_cpu_time. The memory peak
+    is process-wide, so it includes calls that trace memory at the same
+    time. If another call is already being profiled, this one runs without
+    a profile.
+
+    Args:
+        func: Callable without arguments
+        profile (bool): Whether to profile the call with cProfile
+        trace_memory (bool): Whether to record the peak memory with tracemalloc
+        cpu_clock: Callable returning the CPU seconds to measure
+
+    Returns:
+        tuple: (result, metrics, profile_stats); metrics has 'wall', 'cpu' and
+               'peak_memory' (None if not traced); profile_stats is the
+               pstats-compatible stats dict or None
+    """
+    profiler = None
+    if profile and _profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+
+    trace_token = _start_tracing() if trace_memory else None
+    peak_memory = None
+
+    wall_start = time.perf_counter()
+    cpu_start = cpu_clock()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = func()
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    finally:
+        cpu = cpu_clock() - cpu_start
+        wall = time.perf_counter() - wall_start
+        if trace_token is not None:
+            peak_memory = _stop_tracing(trace_token)
+        if profiler is not None:
+            _profile_lock.release()
+
+    stats = None
+    if profiler is not None:
+        profiler.create_stats()
+        stats = profiler.stats
+
+    return result, {'wall': wall, 'cpu': cpu, 'peak_memory': peak_memory}, stats
+
+def profile_rows(stats):
+    """
+    Return the rows of a hot-function table for a profile.
+
+    Returns:
+        list: (function, ncalls, tottime, cumtime, tottime per call) tuples,
+              sorted by cumulative time
+    """
+    rows = []
+    for (file_name, line_no, func_name), (_, ncalls, tottime, cumtime, _) in stats.items():
+        label = func_name if file_name == '~' else f"{func_name} ({file_name}:{line_no})"
+        rows.append((label, ncalls, tottime, cumtime, tottime / ncalls if ncalls else 0.0))
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows
+
+def dump_profile(stats, path):
+    """Write a profile as a .prof file readable by pstats and snakeviz."""
+    with open(path, 'wb') as f:
+        marshal.dump(stats, f)
+
+def append_history(path, record):
+    """Append a run record to the history file; failures are ignored."""
+    try:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError:
+        pass
+
+def load_history(path, module_name, func_name, limit=HISTORY_LIMIT):
+    """Return the last runs of a function from the history file, oldest first."""
+    runs = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('module') == module_name and record.get('function') == func_name:
+                    runs.append(record)
+    except OSError:
+        pass
+    return runs[-limit:]
@@ -0,0 +1,264 @@
+"""Execution backends for the Utility Hub.
+
+run_and_report() runs a utility function and prints its result the way the
+hub console shows it. ProcessBackend runs it in a worker process taken from
+a persistent pool instead, streams the worker's stdout back to the caller
+and can cancel a call or stop it after a timeout by killing the worker and
+any processes it started (the worker is then replaced). Calls are measured
+in the worker (see hub_metrics.measure_call).
+"""
+
+import os
+import sys
+import time
+import signal
+import atexit
+import weakref
+import inspect
+import threading
+import traceback
+import subprocess
+import multiprocessing
+
+from hub_discovery import load_module
+from hub_metrics import measure_call, process_cpu_time
+
+# Number of idle worker processes kept alive between calls
+DEFAULT_POOL_SIZE = 2
+
+# Output is sent from the worker once this many characters are buffered ...
+_OUTPUT_CHUNK = 64 * 1024
+
+# ... or at least this often (seconds)
+_OUTPUT_INTERVAL = 0.1
+
+# Workers are not daemonic, so utility functions can start process pools of
+# their own; the ones still running when the hub exits are stopped here
+_live_workers = weakref.WeakSet()
+
+@atexit.register
+def _stop_live_workers():
+    for worker in list(_live_workers):
+        worker.stop(kill=True)
+
+class ExecutionCancelled(Exception):
+    """Raised when a call was cancelled by the user."""
+
+class ExecutionTimeout(Exception):
+    """Raised when a call exceeded its timeout."""
+
+class RemoteError(Exception):
+    """Raised when the utility function failed in the worker process."""
+    
+    def __init__(self, message, remote_traceback):
+        super().__init__(message)
+        self.remote_traceback = remote_traceback
+
+def run_and_report(func, params):
+    """
+    Call func(**params) and print the result.
+    
+    Generators are consumed and printed item by item; for them the number
+    of items is returned instead of the generator.
+    """
+    result = func(**params)
+    
+    if inspect.isgenerator(result):
+        count = 0
+        for count, item in enumerate(result, 1):
+            print(item)
+        print(f"\n{count} results.")
+        return count
+    
+    if result is not None:
+        print(f"\nResult: {result}")
+    return result
+
+class _PipeWriter:
+    """stdout replacement in the worker that sends output to the hub in chunks."""
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.buffer = []
+        self.size = 0
+        self.last_send = time.monotonic()
+    
+    def write(self, text):
+        self.buffer.append(text)
+        self.size += len(text)
+        if self.size >= _OUTPUT_CHUNK or time.monotonic() - self.last_send >= _OUTPUT_INTERVAL:
+            self.flush()
+    
+    def flush(self):
+        if self.buffer:
+            self.conn.send(('output', "".join(self.buffer)))
+            self.buffer = []
+            self.size = 0
+        self.last_send = time.monotonic()
+
+def _worker_main(conn):
+    """Worker process loop: execute calls until told to stop."""
+    if hasattr(os, 'setsid'):
+        # Own session, so the worker can be killed with the processes it started
+        os.setsid()
+    writer = _PipeWriter(conn)
+    sys.stdout = writer
+    
+    while True:
+        try:
+            call = conn.recv()
+        except EOFError:
+            return
+        if call is None:
+            return
+        
+        module_name, path, func_name, params, profile, trace_memory = call
+        try:
+            func = getattr(load_module(module_name, path), func_name)
+            # The worker runs one call at a time, so its CPU time includes
+            # threads and (finished) process pools the call started
+            result, metrics, stats = measure_call(lambda: run_and_report(func, params), profile, trace_memory,
+                                                  process_cpu_time)
+            writer.flush()
+            try:
+                conn.send(('done', (result, metrics, stats)))
+            except Exception:
+                # Results that cannot be pickled are reported by their repr
+                conn.send(('done', (repr(result), metrics, stats)))
+        except Exception as e:
+            writer.flush()
+            conn.send(('error', (str(e), traceback.format_exc())))
+
+def _kill_tree(process):
+    """Kill a worker process and all processes it started (e.g. process pools)."""
+    try:
+        if sys.platform == 'win32':
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass  # Already gone, or it has not created its session yet
+    if process.is_alive():
+        process.kill()
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=False)
+        self.process.start()
+        child_conn.close()
+        _live_workers.add(self)
+    
+    def stop(self, kill=False):
+        _live_workers.discard(self)
+        if kill:
+            _kill_tree(self.process)
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            _kill_tree(self.process)
+            self.process.join(timeout=1)
+        self.conn.close()
+
+class ProcessBackend:
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        """
+        Create a backend that keeps up to pool_size idle worker processes.
+        
+        Workers are started on first use with the 'spawn' method, which is
+        safe with the Tk main loop and threads in the parent.
+        """
+        self.pool_size = pool_size
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = []
+        self._lock = threading.Lock()
+    
+    def _acquire(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                worker.stop(kill=True)
+        return _Worker(self._context)
+    
+    def _release(self, worker):
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(worker)
+                return
+        worker.stop()
+    
+    def run(self, module_name, path, func_name, params, output, timeout=None, cancel_event=None,
+            profile=False, trace_memory=False):
+        """
+        Run a utility function in a worker process and wait for it.
+        
+        Args:
+            module_name (str): Name of the utility module
+            path (str): Path to the utility module's source file
+            func_name (str): Name of the function to call
+            params (dict): Keyword arguments (must be picklable)
+            output: File-like object receiving the worker's stdout
+            timeout (float, optional): Seconds after which the call is stopped
+            cancel_event (threading.Event, optional): Set to cancel the call
+            profile (bool): Whether to profile the call with cProfile
+            trace_memory (bool): Whether to record the peak memory with tracemalloc
+        
+        Returns:
+            tuple: (result, metrics, profile_stats) as from measure_call, measured
+                   in the worker; the result is its repr if it cannot be pickled
+        
+        Raises:
+            ExecutionCancelled, ExecutionTimeout, RemoteError
+        """
+        worker = self._acquire()
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            worker.conn.send((module_name, path, func_name, params, profile, trace_memory))
+        except BaseException:
+            # Also parameters that cannot be pickled
+            worker.stop(kill=True)
+            raise
+        
+        try:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    worker.stop(kill=True)
+                    raise ExecutionCancelled("Execution cancelled")
+                if deadline is not None and time.monotonic() >= deadline:
+                    worker.stop(kill=True)
+                    raise ExecutionTimeout(f"Execution timed out after {timeout} seconds")
+                
+                if not worker.conn.poll(0.05):
+                    continue
+                
+                try:
+                    kind, payload = worker.conn.recv()
+                except EOFError:
+                    worker.stop(kill=True)
+                    raise RemoteError("Worker process exited unexpectedly", "")
+                
+                if kind == 'output':
+                    output.write(payload)
+                elif kind == 'done':
+                    self._release(worker)
+                    return payload
+                else:
+                    self._release(worker)
+                    raise RemoteError(*payload)
+        except (OSError, KeyboardInterrupt):
+            worker.stop(kill=True)
+            raise
+    
+    def shutdown(self):
+        """Stop all idle worker processes."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
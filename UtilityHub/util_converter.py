@@ -4,6 +4,377 @@ This module provides functions for converting between different units
 of measurement including length, weight, temperature, and more.
 """
 
+import os
+import csv
+import time
+import array
+import operator
+import fractions
+import itertools
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # NumPy arrays are only supported when NumPy is installed
+
+# Functions whose result only depends on their arguments; the hub may cache
+# their results (convert_csv writes a file)
+__pure__ = ("convert", "convert_batch", "celsius_to_fahrenheit", "fahrenheit_to_celsius",
+            "kilometers_to_miles", "miles_to_kilometers", "kilograms_to_pounds", "pounds_to_kilograms")
+
+# Units by dimension: {dimension: {unit: other names}}. Names are case-insensitive.
+_UNITS = {
+    'length': {
+        'm': ('meter', 'meters', 'metre', 'metres'),
+        'km': ('kilometer', 'kilometers', 'kilometre', 'kilometres'),
+        'cm': ('centimeter', 'centimeters', 'centimetre', 'centimetres'),
+        'mm': ('millimeter', 'millimeters', 'millimetre', 'millimetres'),
+        'mi': ('mile', 'miles'),
+        'yd': ('yard', 'yards'),
+        'ft': ('foot', 'feet'),
+        'in': ('inch', 'inches'),
+    },
+    'mass': {
+        'kg': ('kilogram', 'kilograms'),
+        'g': ('gram', 'grams'),
+        'mg': ('milligram', 'milligrams'),
+        'lb': ('lbs', 'pound', 'pounds'),
+        'oz': ('ounce', 'ounces'),
+    },
+    'temperature': {
+        'C': ('°C', 'celsius'),
+        'F': ('°F', 'fahrenheit'),
+        'K': ('kelvin',),
+    },
+}
+
+# Known conversions as (from, to, offset_in, numerator, denominator, offset_out):
+# result = (value + offset_in) * numerator / denominator + offset_out.
+# All are exact definitions, so every chain between two units gives the
+# same result. Conversions in the other direction are derived unless listed.
+_CONVERSION_EDGES = (
+    ('C', 'F', 0, 9, 5, 32),
+    ('F', 'C', -32, 5, 9, 0),
+    ('K', 'C', -273.15, 1, 1, 0),
+    ('km', 'm', 0, 1000, 1, 0),
+    ('cm', 'm', 0, 1, 100, 0),
+    ('mm', 'm', 0, 1, 1000, 0),
+    ('mi', 'm', 0, 1609.344, 1, 0),
+    ('yd', 'm', 0, 0.9144, 1, 0),
+    ('ft', 'm', 0, 0.3048, 1, 0),
+    ('in', 'm', 0, 0.0254, 1, 0),
+    ('g', 'kg', 0, 1, 1000, 0),
+    ('mg', 'g', 0, 1, 1000, 0),
+    ('lb', 'kg', 0, 0.45359237, 1, 0),
+    ('oz', 'lb', 0, 1, 16, 0),
+)
+
+# Conversions of the conversion functions, in the same form. They keep their
+# historical (rounded) factors, so their results do not change; convert()
+# and unit conversions use the exact ones.
+_FUNCTION_CONVERSIONS = {
+    'celsius_to_fahrenheit': (0, 9, 5, 32),
+    'fahrenheit_to_celsius': (-32, 5, 9, 0),
+    'kilometers_to_miles': (0, 0.621371, 1, 0),
+    'miles_to_kilometers': (0, 1.60934, 1, 0),
+    'kilograms_to_pounds': (0, 2.20462, 1, 0),
+    'pounds_to_kilograms': (0, 0.453592, 1, 0),
+}
+
+# Number of CSV rows convert_csv converts and writes at a time
+_CSV_CHUNK_ROWS = 10000
+
+# convert_csv reports its progress after this many rows
+_CSV_PROGRESS_ROWS = 1000000
+
+# Largest numerator or denominator a composed conversion keeps as an exact integer
+_MAX_EXACT_INT = 2 ** 53
+
+def _linear_steps(offset_in, numerator, denominator, offset_out):
+    """
+    Return the steps of a conversion as (operator function, operand) pairs.
+    
+    Additions of 0 and multiplications or divisions by 1 are left out, so
+    the steps perform exactly the operations of the scalar function (which
+    also keeps the sign of -0.0).
+    """
+    steps = []
+    if offset_in:
+        steps.append((operator.add, offset_in))
+    if numerator != 1:
+        steps.append((operator.mul, numerator))
+    if denominator != 1:
+        steps.append((operator.truediv, denominator))
+    if offset_out:
+        steps.append((operator.add, offset_out))
+    return steps
+
+def _exact(number):
+    # Decimal constants are meant exactly as written (0.3048 m per foot)
+    return fractions.Fraction(repr(number)) if isinstance(number, float) else fractions.Fraction(number)
+
+def _compose(first, second):
+    """Return the conversion applying first, then second, computed exactly."""
+    offset_in, scale, offset_out = first
+    second_in, second_scale, second_out = second
+    return offset_in, scale * second_scale, (offset_out + second_in) * second_scale + second_out
+
+def _table_entry(offset_in, scale, offset_out):
+    """Turn an exact composed conversion into (offset_in, numerator, denominator, offset_out)."""
+    def number(value):
+        return int(value) if value.denominator == 1 and abs(value) < _MAX_EXACT_INT else float(value)
+    
+    if scale.numerator < _MAX_EXACT_INT and scale.denominator < _MAX_EXACT_INT:
+        numerator, denominator = scale.numerator, scale.denominator
+    else:
+        numerator, denominator = float(scale), 1
+    return number(offset_in), numerator, denominator, number(offset_out)
+
+def _build_conversion_table():
+    """
+    Compute the conversion of every pair of units of the same dimension.
+    
+    A breadth-first search from every unit over the known conversions (and
+    their inverses) finds the shortest chain to each other unit; the chain
+    is composed with exact fractions into a single conversion. Listed
+    conversions are used as given.
+    
+    Returns:
+        tuple: ({unit name: unit}, {unit: dimension}, {(from, to): steps})
+    """
+    aliases = {}
+    dimensions = {}
+    for dimension, units in _UNITS.items():
+        for unit, names in units.items():
+            dimensions[unit] = dimension
+            for name in (unit,) + names:
+                aliases[name.lower()] = unit
+    
+    edges = collections.defaultdict(dict)
+    for from_unit, to_unit, offset_in, numerator, denominator, offset_out in _CONVERSION_EDGES:
+        edges[from_unit][to_unit] = (offset_in, numerator, denominator, offset_out)
+    for from_unit, to_unit, offset_in, numerator, denominator, offset_out in _CONVERSION_EDGES:
+        # x = (y - offset_out) * denominator / numerator - offset_in
+        edges[to_unit].setdefault(from_unit, (-offset_out, denominator, numerator, -offset_in))
+    
+    table = {}
+    for start in dimensions:
+        table[start, start] = []
+        exact = {start: (fractions.Fraction(0), fractions.Fraction(1), fractions.Fraction(0))}
+        pending = collections.deque([start])
+        while pending:
+            unit = pending.popleft()
+            for target, (offset_in, numerator, denominator, offset_out) in edges[unit].items():
+                if target in exact:
+                    continue
+                step = (_exact(offset_in), _exact(numerator) / _exact(denominator), _exact(offset_out))
+                # Composing with the identity would move offset_in to offset_out
+                exact[target] = step if unit == start else _compose(exact[unit], step)
+                conversion = ((offset_in, numerator, denominator, offset_out) if unit == start
+                              else _table_entry(*exact[target]))
+                table[start, target] = _linear_steps(*conversion)
+                pending.append(target)
+    return aliases, dimensions, table
+
+_UNIT_ALIASES, _UNIT_DIMENSIONS, _CONVERSION_TABLE = _build_conversion_table()
+
+_FUNCTION_STEPS = {name: _linear_steps(*conversion) for name, conversion in _FUNCTION_CONVERSIONS.items()}
+
+def _unit(name):
+    unit = _UNIT_ALIASES.get(str(name).strip().lower())
+    if unit is None:
+        raise ValueError(f"Unknown unit '{name}'; choose from {', '.join(_UNIT_DIMENSIONS)}")
+    return unit
+
+def _conversion_steps(from_unit, to_unit):
+    """Return the precomputed steps converting from_unit to to_unit."""
+    from_unit, to_unit = _unit(from_unit), _unit(to_unit)
+    steps = _CONVERSION_TABLE.get((from_unit, to_unit))
+    if steps is None:
+        raise ValueError(f"Cannot convert {_UNIT_DIMENSIONS[from_unit]} ({from_unit}) "
+                         f"to {_UNIT_DIMENSIONS[to_unit]} ({to_unit})")
+    return steps
+
+def _apply(value, steps):
+    for operation, operand in steps:
+        value = operation(value, operand)
+    return value
+
+def _convert(value, from_unit, to_unit):
+    return _apply(value, _conversion_steps(from_unit, to_unit))
+
+def _parse_values(values):
+    """Parse a comma-separated string of numbers (as entered in the hub)."""
+    try:
+        return [float(value) for value in values.split(',') if value.strip()]
+    except ValueError:
+        raise ValueError("Values must be numbers separated by commas") from None
+
+def _convert_many(values, steps):
+    """Convert all values; returns a container of the same kind as values."""
+    
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        # Whole-array operations; floating arrays keep their precision
+        result = values if values.dtype.kind == 'f' else values.astype(numpy.float64)
+        for operation, operand in steps:
+            result = operation(result, operand)
+        return result.astype(values.dtype, copy=False) if values.dtype.kind == 'f' else result
+    
+    if isinstance(values, str):
+        values = _parse_values(values)
+    # Chained maps of operator functions run each step in C, without a
+    # Python function call per value
+    converted = iter(values)
+    for operation, operand in steps:
+        converted = map(operation, converted, itertools.repeat(operand))
+    if isinstance(values, array.array):
+        return array.array(values.typecode if values.typecode in 'fd' else 'd', converted)
+    if isinstance(values, tuple):
+        return tuple(converted)
+    return list(converted)
+
+def convert(value: float, from_unit: str, to_unit: str) -> float:
+    """
+    Convert a value between two units of the same dimension.
+    
+    Every pair of units is looked up in a table computed when the module is
+    loaded, e.g. 'm' to 'ft', 'oz' to 'g' or 'K' to 'F'.
+    
+    Args:
+        value (float): Value to convert
+        from_unit (str): Unit or unit name of the value, e.g. 'km' or 'miles'
+        to_unit (str): Unit or unit name to convert to
+    
+    Returns:
+        float: The converted value
+    """
+    result = _convert(value, from_unit, to_unit)
+    print(f"{value} {_unit(from_unit)} = {result} {_unit(to_unit)}")
+    return result
+
+def convert_batch(values, conversion: str = "celsius_to_fahrenheit", from_unit: str = "", to_unit: str = ""):
+    """
+    Convert many values at once, without printing each of them.
+    
+    NumPy arrays are converted with whole-array arithmetic; lists, tuples
+    and array.array objects are converted in one pass. The result has the
+    same kind as the input (array.array and NumPy arrays of integers become
+    float arrays), and every value equals the result of the scalar function.
+    
+    Args:
+        values: List, tuple, array.array or NumPy array of numbers, or a
+                string of comma-separated numbers
+        conversion (str): Name of a conversion function of this module,
+                          e.g. 'celsius_to_fahrenheit'
+        from_unit (str): Unit to convert from (with to_unit, replaces conversion)
+        to_unit (str): Unit to convert to
+    
+    Returns:
+        Converted values (a list for a string input)
+    """
+    if from_unit or to_unit:
+        conversion = f"{_unit(from_unit)} to {_unit(to_unit)}"
+        steps = _conversion_steps(from_unit, to_unit)
+    elif conversion in _FUNCTION_STEPS:
+        steps = _FUNCTION_STEPS[conversion]
+    else:
+        raise ValueError(f"Unknown conversion '{conversion}'; choose from {', '.join(_FUNCTION_STEPS)}")
+    
+    result = _convert_many(values, steps)
+    print(f"Converted {len(result)} values with {conversion}")
+    return result
+
+def _convert_column(chunk, index, steps):
+    """Convert one column of a chunk of CSV rows in place; returns (converted, skipped)."""
+    rows = [row for row in chunk if index < len(row)]
+    try:
+        numbers = list(map(float, [row[index] for row in rows]))
+    except ValueError:
+        # Leave empty and non-numeric cells as they are
+        numeric = []
+        for row in rows:
+            try:
+                numeric.append((row, float(row[index])))
+            except ValueError:
+                pass
+        rows = [row for row, _ in numeric]
+        numbers = [number for _, number in numeric]
+    
+    for row, value in zip(rows, _convert_many(numbers, steps)):
+        row[index] = repr(value)
+    return len(rows), len(chunk) - len(rows)
+
+def convert_csv(source, destination, columns, from_unit, to_unit, delimiter=",",
+                chunk_rows: int = _CSV_CHUNK_ROWS):
+    """
+    Convert columns of a CSV file between units, streaming it into a new file.
+    
+    Rows are read, converted and written in chunks, so memory use does not
+    grow with the file size. The first row is the header; the named columns
+    are converted in place and all other cells are copied unchanged, as are
+    empty or non-numeric cells in converted columns.
+    
+    Args:
+        source (str): Path of the CSV file to read
+        destination (str): Path of the CSV file to write
+        columns (str or list): Names of the columns to convert, comma-separated
+        from_unit (str): Unit of the values in the columns, e.g. 'C' or 'km'
+        to_unit (str): Unit to convert to, e.g. 'F' or 'mi'
+        delimiter (str): Field delimiter
+        chunk_rows (int): Number of rows converted and written at a time
+    
+    Returns:
+        dict: Number of rows, converted and skipped cells, seconds and rows per second
+    """
+    steps = _conversion_steps(from_unit, to_unit)
+    if isinstance(columns, str):
+        columns = [name.strip() for name in columns.split(',') if name.strip()]
+    # Opening the destination for writing would truncate the source
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise ValueError("The destination must not be the source file")
+    
+    start = time.perf_counter()
+    rows = converted = skipped = 0
+    next_report = _CSV_PROGRESS_ROWS
+    with open(source, 'r', encoding='utf-8', newline='') as src:
+        reader = csv.reader(src, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"'{source}' is empty")
+        missing = [name for name in columns if name not in header]
+        if missing:
+            raise ValueError(f"Columns not found in '{source}': {', '.join(missing)}")
+        indexes = [header.index(name) for name in columns]
+        
+        with open(destination, 'w', encoding='utf-8', newline='') as dst:
+            writer = csv.writer(dst, delimiter=delimiter)
+            writer.writerow(header)
+            
+            while True:
+                chunk = list(itertools.islice(reader, max(1, chunk_rows)))
+                if not chunk:
+                    break
+                for index in indexes:
+                    chunk_converted, chunk_skipped = _convert_column(chunk, index, steps)
+                    converted += chunk_converted
+                    skipped += chunk_skipped
+                writer.writerows(chunk)
+                
+                rows += len(chunk)
+                if rows >= next_report:
+                    print(f"{rows} rows ({rows / (time.perf_counter() - start):,.0f} rows/s)")
+                    next_report += _CSV_PROGRESS_ROWS
+    
+    seconds = time.perf_counter() - start
+    rows_per_second = rows / seconds if seconds else 0.0
+    print(f"Converted {', '.join(columns)} from {_unit(from_unit)} to {_unit(to_unit)} in {rows} rows")
+    print(f"{converted} values converted, {skipped} cells skipped, "
+          f"{seconds:.2f} s ({rows_per_second:,.0f} rows/s)")
+    
+    return {'rows': rows, 'converted': converted, 'skipped': skipped,
+            'seconds': seconds, 'rows_per_second': rows_per_second}
+
 def celsius_to_fahrenheit(celsius: float) -> float:
     """
     Convert Celsius to Fahrenheit.
@@ -14,7 +385,7 @@ def celsius_to_fahrenheit(celsius: float) -> float:
     Returns:
         float: Temperature in Fahrenheit
     """
-    fahrenheit = (celsius * 9/5) + 32
+    fahrenheit = _apply(celsius, _FUNCTION_STEPS['celsius_to_fahrenheit'])
     print(f"{celsius}°C = {fahrenheit}°F")
     return fahrenheit
 
@@ -28,7 +399,7 @@ def fahrenheit_to_celsius(fahrenheit: float) -> float:
     Returns:
         float: Temperature in Celsius
     """
-    celsius = (fahrenheit - 32) * 5/9
+    celsius = _apply(fahrenheit, _FUNCTION_STEPS['fahrenheit_to_celsius'])
     print(f"{fahrenheit}°F = {celsius}°C")
     return celsius
 
@@ -42,7 +413,7 @@ def kilometers_to_miles(kilometers: float) -> float:
     Returns:
         float: Distance in miles
     """
-    miles = kilometers * 0.621371
+    miles = _apply(kilometers, _FUNCTION_STEPS['kilometers_to_miles'])
     print(f"{kilometers} km = {miles} miles")
     return miles
 
@@ -56,7 +427,7 @@ def miles_to_kilometers(miles: float) -> float:
     Returns:
         float: Distance in kilometers
     """
-    kilometers = miles * 1.60934
+    kilometers = _apply(miles, _FUNCTION_STEPS['miles_to_kilometers'])
     print(f"{miles} miles = {kilometers} km")
     return kilometers
 
@@ -70,7 +441,7 @@ def kilograms_to_pounds(kilograms: float) -> float:
     Returns:
         float: Weight in pounds
     """
-    pounds = kilograms * 2.20462
+    pounds = _apply(kilograms, _FUNCTION_STEPS['kilograms_to_pounds'])
     print(f"{kilograms} kg = {pounds} lbs")
     return pounds
 
@@ -84,6 +455,6 @@ def pounds_to_kilograms(pounds: float) -> float:
     Returns:
         float: Weight in kilograms
     """
-    kilograms = pounds * 0.453592
+    kilograms = _apply(pounds, _FUNCTION_STEPS['pounds_to_kilograms'])
     print(f"{pounds} lbs = {kilograms} kg")
-    return kilograms
\ No newline at end of file
+    return kilograms
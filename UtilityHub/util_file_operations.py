@@ -5,21 +5,128 @@ counting lines in files, and searching for text in files.
 """
 
 import os
+import re
 import glob
+import queue
+import fnmatch
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-def list_files(directory=".", pattern="*.*"):
+# Functions whose result only depends on their arguments and the content of
+# the files named by __file_params__; the hub may cache their results and
+# invalidates them when a file's size or modification time changes
+__pure__ = ("count_lines", "search_text")
+__file_params__ = {"count_lines": ("file_path",), "search_text": ("file_path",)}
+
+# Read size used by the byte-level line counter
+_READ_BUFFER_SIZE = 1024 * 1024
+
+# Maximum number of search results buffered between workers and the consumer
+_SEARCH_QUEUE_SIZE = 10000
+
+def _split_option(value):
+    """Turn a comma separated string or an iterable into a list of strings."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [item.strip() for item in value if item.strip()]
+
+def iter_files(directory=".", pattern="*", recursive: bool = True, extensions="",
+               min_size: int = 0, max_size: int = 0, modified_after: float = 0,
+               modified_before: float = 0, exclude=""):
+    """
+    Walk a directory tree with os.scandir and lazily yield matching files.
+    
+    Filters are applied during the walk. Size and time filters reuse the
+    stat result cached on each DirEntry, so no extra stat calls are made
+    on Windows and at most one per file elsewhere. Memory use does not grow
+    with the number of files in a directory.
+    
+    Args:
+        directory (str): Root directory to walk
+        pattern (str): File name pattern to match (fnmatch syntax)
+        recursive (bool): Whether to descend into subdirectories
+        extensions (str | list): Allowed extensions, e.g. 'py,txt'. Empty allows all.
+        min_size (int): Minimum file size in bytes. 0 disables the filter.
+        max_size (int): Maximum file size in bytes. 0 disables the filter.
+        modified_after (float): Only files modified after this POSIX timestamp
+        modified_before (float): Only files modified before this POSIX timestamp
+        exclude (str | list): Glob patterns for file or directory names (or
+                              paths relative to directory) to skip
+    
+    Yields:
+        os.DirEntry: One entry per matching file
+    """
+    extensions = tuple(ext.lower() if ext.startswith(".") else f".{ext.lower()}"
+                       for ext in _split_option(extensions))
+    exclude = _split_option(exclude)
+    needs_stat = bool(min_size or max_size or modified_after or modified_before)
+    
+    def excluded(entry):
+        if not exclude:
+            return False
+        relative = os.path.relpath(entry.path, directory)
+        return any(fnmatch.fnmatch(entry.name, glob_pattern) or fnmatch.fnmatch(relative, glob_pattern)
+                   for glob_pattern in exclude)
+    
+    pending = [directory]
+    while pending:
+        subdirectories = []
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and not excluded(entry):
+                                subdirectories.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    
+                    if not fnmatch.fnmatch(entry.name, pattern):
+                        continue
+                    if extensions and not entry.name.lower().endswith(extensions):
+                        continue
+                    if excluded(entry):
+                        continue
+                    
+                    if needs_stat:
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        if min_size and stat.st_size < min_size:
+                            continue
+                        if max_size and stat.st_size > max_size:
+                            continue
+                        if modified_after and stat.st_mtime <= modified_after:
+                            continue
+                        if modified_before and stat.st_mtime >= modified_before:
+                            continue
+                    
+                    yield entry
+        except OSError:
+            continue
+        
+        # Visit subdirectories in listing order
+        pending.extend(reversed(subdirectories))
+
+def list_files(directory=".", pattern="*", recursive: bool = False):
     """
     List all files in a directory that match the given pattern.
     
     Args:
         directory (str): Directory path to search in. Defaults to current directory.
         pattern (str): File pattern to match. Defaults to all files.
+        recursive (bool): Whether to include files in subdirectories
     
     Returns:
         list: List of file paths that match the pattern
     """
-    search_path = os.path.join(directory, pattern)
-    files = glob.glob(search_path)
+    files = [entry.path for entry in iter_files(directory, pattern, recursive)]
     
     print(f"Found {len(files)} files matching '{pattern}' in '{directory}':")
     for file in files:
@@ -27,9 +134,39 @@ def list_files(directory=".", pattern="*.*"):
     
     return files
 
+def _count_newlines(file_path, buffer_size=_READ_BUFFER_SIZE):
+    """Count lines in a file by scanning raw bytes for newlines."""
+    line_count = 0
+    last_byte = b"\n"
+    buffer = bytearray(buffer_size)
+    
+    with open(file_path, 'rb', buffering=0) as file:
+        while True:
+            size = file.readinto(buffer)
+            if not size:
+                break
+            line_count += buffer.count(b"\n", 0, size)
+            last_byte = buffer[size - 1:size]
+    
+    # A final line without a trailing newline still counts as a line
+    if last_byte != b"\n":
+        line_count += 1
+    
+    return line_count
+
+def _count_file(file_path):
+    """Process pool worker: return (file_path, line_count), -1 on error."""
+    try:
+        return file_path, _count_newlines(file_path)
+    except OSError:
+        return file_path, -1
+
 def count_lines(file_path):
     """
-    Count the number of lines in a text file.
+    Count the number of lines in a file.
+    
+    The file is read in large binary chunks and newline bytes are counted
+    directly, so no decoding is needed and any encoding is accepted.
     
     Args:
         file_path (str): Path to the file
@@ -38,8 +175,7 @@ def count_lines(file_path):
         int: Number of lines in the file
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            line_count = sum(1 for _ in file)
+        line_count = _count_newlines(file_path)
         
         print(f"File '{file_path}' contains {line_count} lines.")
         return line_count
@@ -48,6 +184,45 @@ def count_lines(file_path):
         print(f"Error counting lines in '{file_path}': {str(e)}")
         return -1
 
+def count_lines_many(path=".", pattern="*", recursive: bool = False, workers: int = 0):
+    """
+    Count lines in many files at once, like `wc -l`.
+    
+    Args:
+        path (str): Directory, single file or glob pattern (e.g. 'logs/*.log')
+        pattern (str): File name pattern used when path is a directory
+        recursive (bool): Whether to descend into subdirectories
+        workers (int): Number of worker processes. 0 uses one per CPU.
+    
+    Returns:
+        dict: {'files': {file_path: line_count}, 'total': total_line_count}.
+              Files that could not be read are reported with -1.
+    """
+    if os.path.isdir(path):
+        files = sorted(entry.path for entry in iter_files(path, pattern, recursive))
+    else:
+        files = sorted(f for f in glob.glob(path, recursive=recursive) if os.path.isfile(f))
+    
+    workers = workers or os.cpu_count() or 1
+    
+    counts = {}
+    if len(files) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(files) // (workers * 4))
+            for file_path, line_count in executor.map(_count_file, files, chunksize=chunksize):
+                counts[file_path] = line_count
+    else:
+        for file_path in files:
+            counts[file_path] = _count_file(file_path)[1]
+    
+    total = sum(count for count in counts.values() if count > 0)
+    
+    for file_path, line_count in counts.items():
+        print(f"{line_count:>10} {file_path}")
+    print(f"{total:>10} total")
+    
+    return {'files': counts, 'total': total}
+
 def search_text(file_path, search_term, case_sensitive=False):
     """
     Search for text in a file and display matching lines.
@@ -62,10 +237,11 @@ def search_text(file_path, search_term, case_sensitive=False):
     """
     try:
         matches = []
+        matcher = re.compile(re.escape(search_term), 0 if case_sensitive else re.IGNORECASE)
         
         with open(file_path, 'r', encoding='utf-8') as file:
             for i, line in enumerate(file, 1):
-                if (search_term in line) if case_sensitive else (search_term.lower() in line.lower()):
+                if matcher.search(line):
                     matches.append((i, line.strip()))
         
         print(f"Found {len(matches)} matches for '{search_term}' in '{file_path}':")
@@ -76,4 +252,126 @@ def search_text(file_path, search_term, case_sensitive=False):
     
     except Exception as e:
         print(f"Error searching text in '{file_path}': {str(e)}")
-        return []
\ No newline at end of file
+        return []
+
+# Flags that can be applied to part of a regex with (?imsx:...)
+_SCOPED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE | re.UNICODE
+
+def _compile_patterns(patterns, case_sensitive):
+    """
+    Build one combined regex for all patterns plus one regex per pattern.
+    
+    Literal strings are escaped, compiled regexes keep their own flags.
+    The combined regex rejects non-matching lines in a single pass; the
+    individual regexes are only run on lines that matched. The combined
+    regex is None (every line is checked with each regex) for a single
+    pattern, and for regexes with groups or flags that cannot be scoped:
+    joining those would renumber backreferences, clash on group names or
+    drop flags such as re.ASCII.
+    """
+    if isinstance(patterns, (str, re.Pattern)):
+        patterns = [patterns]
+    
+    flags = 0 if case_sensitive else re.IGNORECASE
+    sources = []
+    singles = []
+    combinable = True
+    for pattern in patterns:
+        if isinstance(pattern, re.Pattern):
+            inline = ''.join(letter for flag, letter in
+                             ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+                             if pattern.flags & flag)
+            if flags and not pattern.flags & re.IGNORECASE:
+                inline += '-i'
+            sources.append(f"(?{inline}:{pattern.pattern})" if inline else pattern.pattern)
+            singles.append((pattern.pattern, pattern))
+            combinable = combinable and not pattern.groups and not pattern.flags & ~_SCOPED_FLAGS
+        else:
+            sources.append(re.escape(pattern))
+            singles.append((pattern, re.compile(re.escape(pattern), flags)))
+    
+    if not sources:
+        raise ValueError("At least one search pattern is required")
+    
+    if not combinable or len(sources) == 1:
+        return None, singles
+    return re.compile("|".join(f"(?:{source})" for source in sources), flags), singles
+
+def _resolve_files(files):
+    """Turn a directory, glob pattern or iterable of paths into a list of files."""
+    if isinstance(files, str):
+        if os.path.isdir(files):
+            return [entry.path for entry in iter_files(files, recursive=False)]
+        files = glob.glob(files)
+    return [f for f in files if os.path.isfile(f)]
+
+def _search_file(file_path, combined, singles, results, stop):
+    """Thread pool worker: push (file, line_no, pattern, line) tuples to results."""
+    def put(item):
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+            for line_no, line in enumerate(file, 1):
+                if combined is not None and not combined.search(line):
+                    continue
+                line = line.rstrip('\r\n')
+                for label, matcher in singles:
+                    if matcher.search(line) and not put((file_path, line_no, label, line)):
+                        return
+    except OSError as e:
+        put((file_path, e))
+    finally:
+        put(None)
+
+def search_files(patterns, files, case_sensitive: bool = False, workers: int = 0):
+    """
+    Search many files for many patterns at once.
+    
+    All patterns are combined into a single regex, so every line is
+    scanned once no matter how many patterns are given (regexes with groups
+    or flags such as re.ASCII are checked one by one). Files are searched
+    concurrently on a thread pool and results are yielded as soon as they
+    are found.
+    
+    Args:
+        patterns (str | re.Pattern | list): Literal strings and/or compiled regexes
+        files (str | list): Directory, glob pattern or list of file paths
+                            (for example the result of list_files)
+        case_sensitive (bool): Whether literal patterns are case-sensitive
+        workers (int): Number of worker threads. 0 picks a default.
+    
+    Yields:
+        tuple: (file_path, line_number, pattern, line_text) for every match
+    """
+    combined, singles = _compile_patterns(patterns, case_sensitive)
+    files = _resolve_files(files)
+    if not files:
+        return
+    
+    results = queue.Queue(maxsize=_SEARCH_QUEUE_SIZE)
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4))
+    try:
+        for file_path in files:
+            executor.submit(_search_file, file_path, combined, singles, results, stop)
+        
+        pending = len(files)
+        while pending:
+            item = results.get()
+            if item is None:
+                pending -= 1
+            elif len(item) == 2:
+                print(f"Error searching text in '{item[0]}': {str(item[1])}")
+            else:
+                yield item
+    finally:
+        # Also reached when the consumer stops iterating early
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,264 @@
+"""Indexed text search utilities for large directory trees.
+
+This module keeps a persistent trigram index of a directory tree on disk.
+build_index refreshes it incrementally for files whose size or modification
+time changed; searches use it to narrow down the files that need to be
+scanned before matches are verified.
+"""
+
+import os
+import time
+import codecs
+import hashlib
+import sqlite3
+
+from util_file_operations import iter_files, search_files
+
+# Files larger than this are not indexed and are always searched directly
+_MAX_INDEXED_FILE_SIZE = 64 * 1024 * 1024
+
+# Chunk size used while extracting trigrams from a file
+_INDEX_CHUNK_SIZE = 1024 * 1024
+
+# Number of changed files written to the index per transaction
+_INDEX_BATCH_FILES = 500
+
+# Host parameters per statement; older SQLite builds allow no more than 999
+_MAX_QUERY_VARIABLES = 999
+
+# Bump when files must be indexed again (stored as PRAGMA user_version)
+_INDEX_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    indexed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    trigram TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_file ON postings (file_id);
+"""
+
+def _default_index_path(directory):
+    """Return the index location for a directory in the user's home folder."""
+    key = hashlib.sha1(os.path.abspath(directory).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(os.path.expanduser("~"), ".utility_hub", "search_index", f"{key}.sqlite")
+
+def _open_index(directory, index_path):
+    """Open (and create if needed) the index database for a directory."""
+    index_path = index_path or _default_index_path(directory)
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    
+    connection = sqlite3.connect(index_path)
+    connection.executescript(_SCHEMA)
+    if connection.execute("PRAGMA user_version").fetchone()[0] != _INDEX_VERSION:
+        # Built by an older version; rebuilt by the next refresh
+        with connection:
+            connection.execute("DELETE FROM postings")
+            connection.execute("DELETE FROM files")
+        connection.execute(f"PRAGMA user_version = {_INDEX_VERSION}")
+    return connection, index_path
+
+def _walk_files(directory):
+    """Yield (path, stat_result) for every file below directory."""
+    for entry in iter_files(directory):
+        try:
+            yield entry.path, entry.stat()
+        except OSError:
+            continue
+
+def _extract_trigrams(file_path):
+    """Return the set of lowercase trigrams in a text file, or None for binary files."""
+    trigrams = set()
+    tail = ""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    
+    with open(file_path, 'rb') as file:
+        first = True
+        while True:
+            chunk = file.read(_INDEX_CHUNK_SIZE)
+            if first and b"\0" in chunk:
+                return None
+            first = False
+            
+            # Characters split between chunks are completed by the decoder, and
+            # the last two characters are kept so trigrams spanning chunks are found
+            text = tail + decoder.decode(chunk, final=not chunk).lower()
+            trigrams.update(text[i:i + 3] for i in range(len(text) - 2))
+            tail = text[-2:]
+            if not chunk:
+                break
+    
+    return trigrams
+
+def _term_trigrams(search_term):
+    """Return the trigrams a file must contain to match search_term."""
+    term = search_term.lower()
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+def _refresh_index(connection, directory):
+    """Bring the index in line with the directory and return change counts."""
+    known = {path: (file_id, mtime_ns, size)
+             for file_id, path, mtime_ns, size in
+             connection.execute("SELECT id, path, mtime_ns, size FROM files")}
+    
+    added = updated = 0
+    pending = 0
+    try:
+        for path, stat in _walk_files(directory):
+            entry = known.pop(path, None)
+            if entry and entry[1] == stat.st_mtime_ns and entry[2] == stat.st_size:
+                continue
+            
+            # Binary, large and unreadable files are not indexed; searches
+            # always scan them
+            trigrams = None
+            if stat.st_size <= _MAX_INDEXED_FILE_SIZE:
+                try:
+                    trigrams = _extract_trigrams(path)
+                except OSError:
+                    pass
+            indexed = trigrams is not None
+            
+            if entry:
+                file_id = entry[0]
+                connection.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                connection.execute("UPDATE files SET mtime_ns = ?, size = ?, indexed = ? WHERE id = ?",
+                                   (stat.st_mtime_ns, stat.st_size, indexed, file_id))
+                updated += 1
+            else:
+                cursor = connection.execute(
+                    "INSERT INTO files (path, mtime_ns, size, indexed) VALUES (?, ?, ?, ?)",
+                    (path, stat.st_mtime_ns, stat.st_size, indexed))
+                file_id = cursor.lastrowid
+                added += 1
+            
+            if trigrams:
+                connection.executemany("INSERT INTO postings (trigram, file_id) VALUES (?, ?)",
+                                       ((trigram, file_id) for trigram in trigrams))
+            
+            # Committing per file would sync the database for every changed file
+            pending += 1
+            if pending >= _INDEX_BATCH_FILES:
+                connection.commit()
+                pending = 0
+        
+        # Whatever is left in known no longer exists on disk
+        for file_id, _, _ in known.values():
+            connection.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+            connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    
+    return added, updated, len(known)
+
+def _batches(items, size):
+    """Split a list into lists of at most size items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _candidate_files(connection, search_term):
+    """Return the files that may contain search_term according to the index."""
+    trigrams = _term_trigrams(search_term)
+    
+    if not trigrams:
+        # Terms shorter than three characters cannot be narrowed down
+        return [path for (path,) in connection.execute("SELECT path FROM files")]
+    
+    # Long terms have more trigrams than a statement may bind; their file
+    # sets are intersected batch by batch
+    file_ids = None
+    for batch in _batches(sorted(trigrams), _MAX_QUERY_VARIABLES - 1):
+        placeholders = ", ".join("?" * len(batch))
+        query = f"""
+            SELECT file_id FROM postings WHERE trigram IN ({placeholders})
+            GROUP BY file_id HAVING COUNT(*) = ?
+        """
+        batch_ids = {file_id for (file_id,) in connection.execute(query, (*batch, len(batch)))}
+        file_ids = batch_ids if file_ids is None else file_ids & batch_ids
+        if not file_ids:
+            break
+    
+    candidates = [path for (path,) in connection.execute("SELECT path FROM files WHERE indexed = 0")]
+    for batch in _batches(sorted(file_ids), _MAX_QUERY_VARIABLES):
+        placeholders = ", ".join("?" * len(batch))
+        candidates += [path for (path,) in
+                       connection.execute(f"SELECT path FROM files WHERE id IN ({placeholders})", batch)]
+    return candidates
+
+def build_index(directory=".", index_path=""):
+    """
+    Build or incrementally refresh the search index for a directory tree.
+    
+    Only files whose size or modification time changed since the last run
+    are read again; deleted files are dropped from the index.
+    
+    Args:
+        directory (str): Root of the directory tree to index
+        index_path (str): Index database file. Empty uses a per-directory
+                          file below ~/.utility_hub/search_index.
+    
+    Returns:
+        str: Path to the index database
+    """
+    start = time.perf_counter()
+    connection, index_path = _open_index(directory, index_path)
+    try:
+        added, updated, removed = _refresh_index(connection, directory)
+        total = connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    finally:
+        connection.close()
+    
+    elapsed = time.perf_counter() - start
+    print(f"Indexed '{directory}' in {elapsed:.2f}s: {total} files "
+          f"({added} added, {updated} updated, {removed} removed).")
+    print(f"Index file: {index_path}")
+    return index_path
+
+def indexed_search(directory, search_term, case_sensitive: bool = False, index_path="", refresh: bool = False):
+    """
+    Search a directory tree for text using the trigram index.
+    
+    The index narrows the search down to files containing every trigram of
+    the search term; only those files are scanned to verify the matches.
+    The index is used as it is: changes made after the last build_index
+    are only found with refresh (an empty index is always built first).
+    
+    Args:
+        directory (str): Root of the indexed directory tree
+        search_term (str): Text to search for
+        case_sensitive (bool): Whether the search should be case-sensitive
+        index_path (str): Index database file. Empty uses the default location.
+        refresh (bool): Whether to refresh the index for changed files first,
+                        which walks the whole tree
+    
+    Returns:
+        list: List of tuples containing (file_path, line_number, line_text) for matches
+    """
+    start = time.perf_counter()
+    connection, index_path = _open_index(directory, index_path)
+    try:
+        if refresh or not connection.execute("SELECT 1 FROM files LIMIT 1").fetchone():
+            _refresh_index(connection, directory)
+        candidates = _candidate_files(connection, search_term)
+    finally:
+        connection.close()
+    
+    matches = [(file_path, line_no, line)
+               for file_path, line_no, _, line in search_files(search_term, candidates, case_sensitive)]
+    matches.sort()
+    
+    elapsed = time.perf_counter() - start
+    print(f"Found {len(matches)} matches for '{search_term}' in {len(candidates)} candidate files "
+          f"({elapsed * 1000:.1f} ms):")
+    for file_path, line_no, line in matches:
+        print(f"{file_path}:{line_no}: {line}")
+    
+    return matches
@@ -4,49 +4,400 @@ This module provides functions for text transformation, analysis,
 and formatting.
 """
 
+import os
 import re
+import glob
+import math
+import heapq
+import codecs
+import hashlib
+import functools
+import itertools
+import collections
+from concurrent.futures import ProcessPoolExecutor
 
-def word_count(text):
+from util_file_operations import iter_files
+
+# Functions whose result only depends on their arguments (and the content of
+# the files named by __file_params__); the hub may cache their results
+__pure__ = ("word_count", "word_count_file", "format_text", "extract_emails")
+__file_params__ = {"word_count_file": ("source",)}
+
+_WORD_RE = re.compile(r'\b\w+\b')
+_NON_WORD_RE = re.compile(r'\W')
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_DIGIT_RE = re.compile(r'\d')
+# Matches up to and including the last whitespace character
+_UP_TO_LAST_SPACE_RE = re.compile(r'.*\s', re.DOTALL)
+
+# Size of the chunks a file is tokenized in
+_WORD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Chunks a single word may span before it is split anyway
+_MAX_WORD_CHUNKS = 4
+
+# Matches up to and including the last non-word character of text decoded
+# with surrogateescape (escaped bytes of split characters are not boundaries)
+_UP_TO_LAST_NON_WORD_RE = re.compile(r'.*[^\w\udc80-\udcff]', re.DOTALL)
+
+# Number of characters format_text_file and extract_all read at a time
+_FORMAT_CHUNK_SIZE = 1024 * 1024
+
+# Chunks format_text_file carries over without whitespace before it splits
+_MAX_FORMAT_CARRY_CHUNKS = 4
+
+# Patterns of extract_all. A match is reported for the first type (in this
+# order) that matches at a position, so a URL containing an IP address or an
+# e-mail address is reported as a URL only.
+_HEX = r'[0-9A-Fa-f]{1,4}'
+_OCTET = r'(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+_EXTRACTOR_PATTERNS = {
+    'url': r'\b(?:https?|ftp)://[^\s<>"\']*[^\s<>"\'.,;:!?)\]]',
+    'email': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+    'ipv6': (r'(?<![\w:])(?:'
+             rf'(?:{_HEX}:){{7}}{_HEX}|'
+             rf'(?:{_HEX}:){{1,6}}:{_HEX}|'
+             rf'(?:{_HEX}:){{1,5}}(?::{_HEX}){{1,2}}|'
+             rf'(?:{_HEX}:){{1,4}}(?::{_HEX}){{1,3}}|'
+             rf'(?:{_HEX}:){{1,3}}(?::{_HEX}){{1,4}}|'
+             rf'(?:{_HEX}:){{1,2}}(?::{_HEX}){{1,5}}|'
+             rf'{_HEX}:(?::{_HEX}){{1,6}}|'
+             rf':(?::{_HEX}){{1,7}}|'
+             rf'(?:{_HEX}:){{1,7}}:'
+             r')(?![\w:])'),
+    'ipv4': rf'(?<![\w.]){_OCTET}(?:\.{_OCTET}){{3}}(?!\w|\.\d)',
+    'phone': r'(?<![\w+])(?:\+\d{1,3}[ .-]?)?(?:\(\d{2,4}\)[ .-]?|\d{2,4}[ .-])\d{3,4}[ .-]\d{3,4}(?!\w)',
+}
+_EMAIL_RE = re.compile(_EXTRACTOR_PATTERNS['email'])
+
+# Distinct values per type kept by extract_all; beyond that, new values are
+# only counted, deduplicated with a Bloom filter
+_MAX_EXTRACTED_VALUES = 100000
+
+# Values a Bloom filter is sized for at most, and its false positive rate at
+# that size. Filters for smaller inputs are sized for at most one value per
+# _MIN_VALUE_BYTES bytes: every value takes three characters and a separator.
+_BLOOM_CAPACITY = 10000000
+_BLOOM_ERROR_RATE = 0.01
+_MIN_VALUE_BYTES = 4
+
+# Tasks per worker process in extract_all; a task scans consecutive files
+# with one set of deduplicators, so few filters are sent back
+_EXTRACT_TASKS_PER_WORKER = 4
+
+# Bytes that can be part of a word in UTF-8 text: ASCII word characters and
+# all bytes of multi-byte characters. Any other (ASCII) byte never occurs
+# inside a word or an encoded character, so chunks can be split after it.
+_WORD_BYTES = bytes(range(0x80, 0x100)) + b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_"
+
+class _SpaceSaving:
+    """
+    Space-Saving heavy hitter summary with a fixed number of counters.
+    
+    With N words counted (total weight) and m counters, every estimate
+    overestimates the true count by at most its recorded error, which is
+    at most N / m, and every word occurring more than N / m times is
+    monitored. Updates may carry a weight, so partial counts can be merged.
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        # Min-heap of (count, sequence, word); entries of words whose count
+        # grew since they were pushed are refreshed lazily on eviction
+        self._heap = []
+        self._sequence = itertools.count()
+    
+    def update(self, word, weight=1):
+        counts = self.counts
+        if word in counts:
+            counts[word] += weight
+            return
+        if len(counts) < self.capacity:
+            counts[word] = weight
+            self.errors[word] = 0
+            heapq.heappush(self._heap, (weight, next(self._sequence), word))
+            return
+        
+        # Replace the word with the smallest count
+        heap = self._heap
+        while True:
+            count, _, victim = heap[0]
+            if counts[victim] == count:
+                break
+            heapq.heapreplace(heap, (counts[victim], next(self._sequence), victim))
+        del counts[victim]
+        del self.errors[victim]
+        counts[word] = count + weight
+        self.errors[word] = count
+        heapq.heapreplace(heap, (count + weight, next(self._sequence), word))
+    
+    def update_counts(self, counter):
+        for word, weight in counter.items():
+            self.update(word, weight)
+    
+    @property
+    def max_error(self):
+        """Upper bound of the overestimate of any count (the smallest counter)."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+def _word_stats(counter, total, top_k, include_frequencies):
+    """Build the word_count statistics from a Counter filled in text order."""
+    return {
+        'total_words': total,
+        'unique_words': len(counter),
+        'word_frequencies': dict(counter) if include_frequencies else None,
+        # Counter.most_common selects with a heap; ties keep the order of first
+        # occurrence, as a stable sort would
+        'most_common': counter.most_common(top_k)
+    }
+
+def _approximate_stats(summary, total, top_k, include_frequencies):
+    """Build the word_count statistics from a Space-Saving summary."""
+    return {
+        'total_words': total,
+        'unique_words': None,
+        'word_frequencies': dict(summary.counts) if include_frequencies else None,
+        'most_common': heapq.nlargest(top_k, summary.counts.items(), key=lambda item: item[1]),
+        'approximate': {
+            'counters': summary.capacity,
+            'max_error': summary.max_error,
+            'errors': dict(summary.errors),
+        },
+    }
+
+def _print_word_stats(stats):
+    print(f"Total words: {stats['total_words']}")
+    if stats['unique_words'] is None:
+        approximate = stats['approximate']
+        print(f"Approximate counts from {approximate['counters']} counters: each count is at most "
+              f"{approximate['max_error']} too high, every word occurring more than that is listed")
+    else:
+        print(f"Unique words: {stats['unique_words']}")
+    print("Most common words:")
+    for word, count in stats['most_common']:
+        print(f"- '{word}': {count} occurrences")
+
+def _count_words(counters, top_k, include_frequencies, max_counters):
+    """Merge (Counter, word count) pairs in text order into word statistics."""
+    total = 0
+    if max_counters > 0:
+        summary = _SpaceSaving(max_counters)
+        for counter, count in counters:
+            summary.update_counts(counter)
+            total += count
+        return _approximate_stats(summary, total, top_k, include_frequencies)
+    
+    merged = collections.Counter()
+    for counter, count in counters:
+        merged.update(counter)
+        total += count
+    return _word_stats(merged, total, top_k, include_frequencies)
+
+def _iter_text_counters(text, chunk_size=_WORD_CHUNK_SIZE):
+    """Yield (Counter, word count) for pieces of a string split between words."""
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        if end < len(text):
+            match = _NON_WORD_RE.search(text, end)
+            end = match.end() if match else len(text)
+        words = _WORD_RE.findall(text[start:end].lower())
+        yield collections.Counter(words), len(words)
+        start = end
+
+def word_count(text, top_k: int = 5, include_frequencies: bool = True, max_counters: int = 0):
     """
     Count the number of words in a text.
     
     Args:
         text (str): The text to analyze
+        top_k (int): Number of most common words to report
+        include_frequencies (bool): Whether to return the full frequency table
+                                    ('word_frequencies' is None otherwise)
+        max_counters (int): 0 counts exactly. A positive number estimates the most
+                            common words with that many counters (Space-Saving):
+                            memory stays fixed, counts are at most total/max_counters
+                            too high, and 'unique_words' is None.
     
     Returns:
-        dict: Dictionary with word count statistics
+        dict: Dictionary with word count statistics; approximate results also
+              contain 'approximate' with the error bound and per-word errors
     """
-    # Clean the text and split into words
-    words = re.findall(r'\b\w+\b', text.lower())
+    if max_counters > 0:
+        stats = _count_words(_iter_text_counters(text), top_k, include_frequencies, max_counters)
+    else:
+        # Clean the text, split into words and count them
+        words = _WORD_RE.findall(text.lower())
+        stats = _word_stats(collections.Counter(words), len(words), top_k, include_frequencies)
     
-    # Count unique words
-    unique_words = set(words)
+    # Print results
+    _print_word_stats(stats)
     
-    # Count word frequencies
-    word_freq = {}
-    for word in words:
-        word_freq[word] = word_freq.get(word, 0) + 1
+    return stats
+
+def _non_ascii_split(data):
+    """Return the offset after the last non-word character of UTF-8 data (0 if none)."""
+    text = data.decode('utf-8', errors='surrogateescape')
+    match = _UP_TO_LAST_NON_WORD_RE.match(text)
+    if match is None:
+        return 0
+    return len(text[:match.end()].encode('utf-8', errors='surrogateescape'))
+
+def _iter_word_chunks(stream, chunk_size=_WORD_CHUNK_SIZE):
+    """
+    Yield UTF-8 byte chunks of a stream that end between words.
     
-    # Find most common words
-    most_common = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:5]
+    Each chunk ends after an ASCII non-word byte, or after a non-ASCII
+    non-word character (such as an ideographic space) if the data has no
+    ASCII one; the rest is carried over to the next chunk, so no word or
+    character is split. Only a single word longer than _MAX_WORD_CHUNKS
+    chunks is split (at a character boundary) to bound memory use. Text
+    streams are encoded to UTF-8.
+    """
+    carry = b""
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        if isinstance(data, str):
+            data = data.encode('utf-8', errors='surrogatepass')
+        data = carry + data
+        
+        # Split after the last byte that cannot be part of a word
+        split = len(data.rstrip(_WORD_BYTES))
+        if split == 0:
+            split = _non_ascii_split(data)
+        if split == 0:
+            if len(data) < chunk_size * _MAX_WORD_CHUNKS:
+                # One huge token without a boundary yet; keep reading
+                carry = data
+                continue
+            # Split before the last character, which may be incomplete
+            split = len(data.rstrip(bytes(range(0x80, 0xC0))))
+            if split <= 1:
+                split = len(data)
+            else:
+                split -= 1
+        yield data[:split]
+        carry = data[split:]
+    if carry:
+        yield carry
+
+def _count_chunk(chunk):
+    """Process pool worker: return (Counter of the words in a chunk, word count)."""
+    words = _WORD_RE.findall(chunk.decode('utf-8', errors='replace').lower())
+    return collections.Counter(words), len(words)
+
+def _map_chunks(chunks, workers):
+    """Yield _count_chunk results in input order, counted on a process pool."""
+    if workers <= 1:
+        yield from map(_count_chunk, chunks)
+        return
     
-    # Calculate statistics
-    stats = {
-        'total_words': len(words),
-        'unique_words': len(unique_words),
-        'word_frequencies': word_freq,
-        'most_common': most_common
-    }
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a few chunks per worker in flight to bound memory use
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_count_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def word_count_file(source, workers: int = 0, top_k: int = 5, include_frequencies: bool = True,
+                    max_counters: int = 0):
+    """
+    Count the words in a file or stream without loading it into memory.
     
-    # Print results
-    print(f"Total words: {stats['total_words']}")
-    print(f"Unique words: {stats['unique_words']}")
-    print("Most common words:")
-    for word, count in stats['most_common']:
-        print(f"- '{word}': {count} occurrences")
+    The input is read in chunks that are split between words and counted
+    on a process pool; the partial counts are merged in input order, so the
+    result equals word_count() on the whole text. Memory use depends on the
+    vocabulary size, not on the size of the input; with max_counters it is
+    fixed.
+    
+    Args:
+        source (str or file object): Path to a UTF-8 text file, or an open
+                                     binary or text stream
+        workers (int): Number of worker processes; 0 uses the number of CPUs,
+                       1 counts in the calling process
+        top_k (int): Number of most common words to report
+        include_frequencies (bool): Whether to return the full frequency table
+        max_counters (int): 0 counts exactly, a positive number estimates the
+                            most common words with that many counters (see word_count)
+    
+    Returns:
+        dict: Dictionary with word count statistics (as from word_count)
+    """
+    workers = workers or os.cpu_count() or 1
+    
+    stream = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    try:
+        stats = _count_words(_map_chunks(_iter_word_chunks(stream), workers),
+                             top_k, include_frequencies, max_counters)
+    finally:
+        if stream is not source:
+            stream.close()
+    
+    _print_word_stats(stats)
     
     return stats
 
+def _sentence_case(text):
+    return '. '.join(s.strip().capitalize() for s in text.split('.'))
+
+_CASE_FUNCTIONS = {
+    'lower': str.lower,
+    'upper': str.upper,
+    'title': str.title,
+    'sentence': _sentence_case,
+}
+
+class _DeletionTable(dict):
+    """
+    str.translate table that deletes punctuation and/or digits.
+    
+    Entries are computed the first time a character is looked up and then
+    kept, so the table covers all of Unicode without being built up front.
+    """
+    
+    def __init__(self, remove_punctuation, remove_numbers):
+        super().__init__()
+        self.remove_punctuation = remove_punctuation
+        self.remove_numbers = remove_numbers
+        for code in range(128):
+            self[code]
+    
+    def __missing__(self, code):
+        char = chr(code)
+        delete = ((self.remove_punctuation and _PUNCTUATION_RE.match(char)) or
+                  (self.remove_numbers and _DIGIT_RE.match(char)))
+        value = None if delete else code
+        self[code] = value
+        return value
+
+@functools.lru_cache(maxsize=None)
+def _format_pipeline(case, remove_punctuation, remove_numbers):
+    """
+    Return (case function or None, translate table or None) for format_text options.
+    
+    Punctuation and number removal only delete single characters, so both
+    run in one str.translate pass after the case conversion.
+    """
+    table = _DeletionTable(remove_punctuation, remove_numbers) if remove_punctuation or remove_numbers else None
+    return _CASE_FUNCTIONS.get(case), table
+
+def _apply_format(text, case, remove_punctuation, remove_numbers):
+    case_function, table = _format_pipeline(case, bool(remove_punctuation), bool(remove_numbers))
+    if case_function is not None:
+        text = case_function(text)
+    if table is not None:
+        text = text.translate(table)
+    return text
+
 def format_text(text, case='lower', remove_punctuation=False, remove_numbers=False):
     """
     Format text according to specified options.
@@ -60,31 +411,121 @@ def format_text(text, case='lower', remove_punctuation=False, remove_numbers=Fal
     Returns:
         str: The formatted text
     """
-    result = text
-    
-    # Apply case formatting
-    if case == 'lower':
-        result = result.lower()
-    elif case == 'upper':
-        result = result.upper()
-    elif case == 'title':
-        result = result.title()
-    elif case == 'sentence':
-        result = '. '.join(s.strip().capitalize() for s in result.split('.'))
-    
-    # Remove punctuation if requested
-    if remove_punctuation:
-        result = re.sub(r'[^\w\s]', '', result)
-    
-    # Remove numbers if requested
-    if remove_numbers:
-        result = re.sub(r'\d+', '', result)
+    result = _apply_format(text, case, remove_punctuation, remove_numbers)
     
     print("Formatted text:")
     print(result)
     
     return result
 
+class _SentenceCaser:
+    """
+    Streaming version of the 'sentence' case of format_text.
+    
+    Text is fed in pieces that end after whitespace (or at the end of the
+    input). Like the in-memory version, every '.' ends a sentence and is
+    written as '. ', sentences are stripped and capitalized: the first
+    character of a sentence is title-cased and the rest lowercased.
+    Whitespace at the end of a piece is held back until it is known not to
+    end the sentence.
+    """
+    
+    def __init__(self):
+        self.started = False
+        self.pending = ""
+    
+    def _sentence_part(self, text):
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return ""
+        
+        core = text.rstrip()
+        if not core:
+            self.pending += text
+            return ""
+        
+        result = self.pending + (core.lower() if self.started else core.capitalize())
+        self.started = True
+        self.pending = text[len(core):]
+        return result
+    
+    def feed(self, text):
+        parts = text.split('.')
+        result = []
+        for part in parts[:-1]:
+            result.append(self._sentence_part(part))
+            result.append('. ')
+            self.started = False
+            self.pending = ""
+        result.append(self._sentence_part(parts[-1]))
+        return "".join(result)
+
+def format_text_file(source, destination, case='lower', remove_punctuation=False, remove_numbers=False):
+    """
+    Format a UTF-8 text file into another file without loading it into memory.
+    
+    The output is the same as format_text() on the whole file. The file is
+    processed in chunks that end after whitespace, so case conversion does
+    not split a word. Only text without whitespace longer than
+    _MAX_FORMAT_CARRY_CHUNKS chunks is split anyway, which bounds memory use
+    (title case then restarts at the split).
+    
+    Args:
+        source (str): Path of the text file to format
+        destination (str): Path of the output file
+        case (str): Case formatting ('lower', 'upper', 'title', 'sentence')
+        remove_punctuation (bool): Whether to remove punctuation
+        remove_numbers (bool): Whether to remove numbers
+    
+    Returns:
+        dict: Number of characters read and written
+    """
+    case_function, table = _format_pipeline(case, bool(remove_punctuation), bool(remove_numbers))
+    if case == 'sentence':
+        case_function = _SentenceCaser().feed
+    
+    def transform(text):
+        if case_function is not None:
+            text = case_function(text)
+        if table is not None:
+            text = text.translate(table)
+        return text
+    
+    characters_read = characters_written = 0
+    with open(source, 'r', encoding='utf-8', errors='surrogateescape', newline='') as src, \
+            open(destination, 'w', encoding='utf-8', errors='surrogateescape', newline='') as dst:
+        carry = ""
+        while True:
+            data = src.read(_FORMAT_CHUNK_SIZE)
+            if not data:
+                break
+            characters_read += len(data)
+            
+            # Only process up to the last whitespace; a word may continue in the
+            # next chunk. The carry holds no whitespace, so only data is searched.
+            match = _UP_TO_LAST_SPACE_RE.match(data)
+            if match is None:
+                carry += data
+                if len(carry) < _FORMAT_CHUNK_SIZE * _MAX_FORMAT_CARRY_CHUNKS:
+                    continue
+                result = transform(carry)
+                carry = ""
+            else:
+                result = transform(carry + data[:match.end()])
+                carry = data[match.end():]
+            dst.write(result)
+            characters_written += len(result)
+        
+        result = transform(carry)
+        dst.write(result)
+        characters_written += len(result)
+    
+    print(f"Formatted {characters_read} characters from {source}")
+    print(f"Wrote {characters_written} characters to {destination}")
+    
+    return {'characters_read': characters_read, 'characters_written': characters_written}
+
 def extract_emails(text):
     """
     Extract email addresses from text.
@@ -95,14 +536,270 @@ def extract_emails(text):
     Returns:
         list: List of found email addresses
     """
-    # Regular expression for matching email addresses
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    
     # Find all matches
-    emails = re.findall(email_pattern, text)
+    emails = _EMAIL_RE.findall(text)
     
     print(f"Found {len(emails)} email addresses:")
     for email in emails:
         print(f"- {email}")
     
-    return emails
\ No newline at end of file
+    return emails
+
+def _parse_types(types):
+    if isinstance(types, str):
+        types = [name.strip() for name in types.split(',') if name.strip()]
+    types = tuple(types) or tuple(_EXTRACTOR_PATTERNS)
+    for name in types:
+        if name not in _EXTRACTOR_PATTERNS:
+            raise ValueError(f"Unknown extractor '{name}'; choose from {', '.join(_EXTRACTOR_PATTERNS)}")
+    return types
+
+@functools.lru_cache(maxsize=None)
+def _extractor_regex(types):
+    """Combine the patterns of the given types into one regex with a named group per type."""
+    ordered = [name for name in _EXTRACTOR_PATTERNS if name in types]
+    alternatives = "|".join(f"(?P<{name}>{_EXTRACTOR_PATTERNS[name]})" for name in ordered)
+    # No match starts right after an ASCII letter or digit; checking that once
+    # skips the positions inside words before any alternative is tried
+    return re.compile(f"(?<![A-Za-z0-9])(?:{alternatives})")
+
+class _BloomFilter:
+    """Bit array Bloom filter; add() tells whether a value was (probably) not seen before."""
+    
+    def __init__(self, capacity=_BLOOM_CAPACITY, error_rate=_BLOOM_ERROR_RATE):
+        # Optimal size and number of hashes for the capacity and error rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+    
+    def add(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        bits = self.bits
+        new = False
+        for i in range(self.hashes):
+            position = (first + i * second) % self.size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        return new
+    
+    def update(self, other):
+        """Add all values of another filter of the same size."""
+        merged = int.from_bytes(self.bits, 'little') | int.from_bytes(other.bits, 'little')
+        self.bits = bytearray(merged.to_bytes(len(self.bits), 'little'))
+    
+    def estimate(self):
+        """Estimate the number of distinct values added from the bits set."""
+        set_bits = bin(int.from_bytes(self.bits, 'little')).count("1")
+        if set_bits >= self.size:
+            return float('inf')
+        return -self.size / self.hashes * math.log(1 - set_bits / self.size)
+
+class _Deduplicator:
+    """
+    Distinct values of one type: exact in a set up to max_values values,
+    then counted approximately with a Bloom filter.
+    """
+    
+    def __init__(self, max_values, bloom_capacity=_BLOOM_CAPACITY):
+        self.max_values = max_values
+        self.bloom_capacity = bloom_capacity
+        self.values = {}
+        self.bloom = None
+        self.unique = 0
+        # Whether filters of other deduplicators were merged into the filter
+        self.merged_filters = False
+    
+    def _start_filter(self):
+        self.bloom = _BloomFilter(self.bloom_capacity)
+        for seen in self.values:
+            self.bloom.add(seen)
+    
+    def add(self, value):
+        if value in self.values:
+            return
+        if len(self.values) < self.max_values:
+            self.values[value] = None
+            self.unique += 1
+            if self.bloom is not None:
+                self.bloom.add(value)
+            return
+        if self.bloom is None:
+            self._start_filter()
+        if self.bloom.add(value):
+            self.unique += 1
+    
+    def merge(self, other):
+        """Add the distinct values of another deduplicator with the same filter capacity."""
+        for value in other.values:
+            self.add(value)
+        if other.bloom is not None:
+            if self.bloom is None:
+                self._start_filter()
+            self.bloom.update(other.bloom)
+            self.merged_filters = True
+    
+    @property
+    def count(self):
+        """Number of distinct values; estimated once a filter is in use."""
+        if self.merged_filters:
+            return max(len(self.values), round(self.bloom.estimate()))
+        return self.unique
+
+def _iter_line_chunks(stream, chunk_size=_FORMAT_CHUNK_SIZE):
+    """Yield pieces of a text stream that end at a line break (or the end)."""
+    carry = ""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        data = stream.read(chunk_size)
+        if isinstance(data, bytes):
+            # Characters split between reads are completed by the decoder
+            data = decoder.decode(data, final=not data)
+        if not data:
+            break
+        data = carry + data
+        split = data.rfind('\n') + 1
+        if split == 0:
+            carry = data
+            continue
+        yield data[:split]
+        carry = data[split:]
+    if carry:
+        yield carry
+
+def _scan_stream(stream, types, distinct):
+    """Add the values in a stream to distinct ({type: _Deduplicator}) and return the matches per type."""
+    regex = _extractor_regex(types)
+    counts = dict.fromkeys(types, 0)
+    adders = {name: dedup.add for name, dedup in distinct.items()}
+    for chunk in _iter_line_chunks(stream):
+        for match in regex.finditer(chunk):
+            name = match.lastgroup
+            counts[name] += 1
+            adders[name](match.group())
+    return counts
+
+def _scan_files(file_paths, types, max_values, bloom_capacity):
+    """
+    Process pool worker: scan files one after another.
+    
+    Returns:
+        tuple: (matches per type, {type: _Deduplicator}, {file_path: error})
+    """
+    counts = dict.fromkeys(types, 0)
+    distinct = {name: _Deduplicator(max_values, bloom_capacity) for name in types}
+    errors = {}
+    for file_path in file_paths:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                file_counts = _scan_stream(f, types, distinct)
+        except OSError as e:
+            errors[file_path] = str(e)
+            continue
+        for name in types:
+            counts[name] += file_counts[name]
+    return counts, distinct, errors
+
+def _bloom_capacity(files):
+    """Return the Bloom filter capacity needed for the distinct values of some files."""
+    total = 0
+    for file_path in files:
+        try:
+            total += os.path.getsize(file_path)
+        except OSError:
+            pass
+    return max(1, min(_BLOOM_CAPACITY, total // _MIN_VALUE_BYTES))
+
+def _extraction_files(source):
+    """Turn a file, directory (walked recursively), glob pattern or list of paths into files."""
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        if os.path.isdir(source):
+            return sorted(entry.path for entry in iter_files(source))
+        if os.path.isfile(source):
+            return [source]
+        return sorted(f for f in glob.glob(source, recursive=True) if os.path.isfile(f))
+    return list(source)
+
+def extract_all(source, types="email,url,ipv4,ipv6,phone", workers: int = 0,
+                max_values: int = _MAX_EXTRACTED_VALUES):
+    """
+    Extract e-mail addresses, URLs, IP addresses and phone numbers in one pass.
+    
+    All selected patterns are combined into one regex with a named group per
+    type, so the input is scanned once however many types are selected.
+    Matches do not overlap: where several types match at the same position,
+    the first type in the order url, email, ipv6, ipv4, phone wins. Files
+    are read in chunks of whole lines and scanned in parallel on a process
+    pool. The phone and URL patterns are heuristics, not validators.
+    
+    Args:
+        source (str or file object): File, directory, glob pattern or list of
+                                     files, or an open text or binary stream
+        types (str or list): Comma-separated extractor types to run; empty
+                             selects all
+        workers (int): Number of worker processes for several files; 0 uses
+                       the number of CPUs
+        max_values (int): Distinct values per type kept, in the whole scan as
+                          well as per worker task. Past this number distinct
+                          values are counted with a Bloom filter sized for the
+                          input, so 'unique' is then an estimate.
+    
+    Returns:
+        dict: 'counts' (matches per type), 'unique' (distinct values per type),
+              'values' (distinct values per type in order of appearance),
+              'approximate' (types whose 'unique' comes from a Bloom filter)
+              and 'errors' ({file_path: message} for unreadable files)
+    """
+    types = _parse_types(types)
+    
+    if hasattr(source, 'read'):
+        distinct = {name: _Deduplicator(max_values) for name in types}
+        counts = _scan_stream(source, types, distinct)
+        errors = {}
+    else:
+        files = _extraction_files(source)
+        # All filters share one size, so they can be merged
+        bloom_capacity = _bloom_capacity(files)
+        workers = workers or os.cpu_count() or 1
+        if len(files) > 1 and workers > 1:
+            # Consecutive files per task keep the values in order of appearance
+            tasks = min(len(files), workers * _EXTRACT_TASKS_PER_WORKER)
+            bounds = [len(files) * i // tasks for i in range(tasks + 1)]
+            batches = [files[start:end] for start, end in zip(bounds, bounds[1:])]
+            
+            counts = dict.fromkeys(types, 0)
+            distinct = {name: _Deduplicator(max_values, bloom_capacity) for name in types}
+            errors = {}
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_scan_files, batches, [types] * tasks, [max_values] * tasks,
+                                       [bloom_capacity] * tasks)
+                for batch_counts, batch_distinct, batch_errors in results:
+                    for name in types:
+                        counts[name] += batch_counts[name]
+                        distinct[name].merge(batch_distinct[name])
+                    errors.update(batch_errors)
+        else:
+            counts, distinct, errors = _scan_files(files, types, max_values, bloom_capacity)
+    
+    for file_path, error in errors.items():
+        print(f"Error reading '{file_path}': {error}")
+    for name in types:
+        dedup = distinct[name]
+        approximate = " (approximately)" if dedup.bloom is not None else ""
+        print(f"{name}: {counts[name]} matches, {dedup.count} unique{approximate}")
+        for value in list(dedup.values)[:10]:
+            print(f"- {value}")
+        if dedup.count > 10:
+            print(f"  ... and {dedup.count - 10} more")
+    
+    return {
+        'counts': counts,
+        'unique': {name: dedup.count for name, dedup in distinct.items()},
+        'values': {name: list(dedup.values) for name, dedup in distinct.items()},
+        'approximate': [name for name, dedup in distinct.items() if dedup.bloom is not None],
+        'errors': errors,
+    }
@@ -0,0 +1,109 @@
+"""Test data generators for the benchmarks.
+
+All generators are deterministic for a given seed, so results of different
+runs are measured on identical data.
+"""
+
+import os
+import random
+
+# Word list for the text corpora; a Zipf-like distribution comes from repetition
+_WORDS = ("the of and to in is was that for it with as his on be at by had are but from or have an they "
+          "which one you were all we her she there would their will when who him been has more if no out "
+          "data file system value process result number string function directory performance memory "
+          "buffer stream parallel worker thread index search pattern utility conversion temperature").split()
+
+_LEVELS = ("INFO", "INFO", "INFO", "DEBUG", "WARNING", "ERROR")
+
+def _sentence(rng, min_words=6, max_words=18):
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + rng.choice(".!?,;.")
+
+def make_text_corpus(path, size_bytes, seed=1, email_rate=0.01, number_rate=0.02):
+    """
+    Write a prose-like text file of roughly size_bytes.
+    
+    A fraction of the sentences carries an e-mail address or a number so
+    extraction and formatting benchmarks have something to find.
+    """
+    rng = random.Random(seed)
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        while written < size_bytes:
+            paragraph = []
+            for _ in range(rng.randint(3, 8)):
+                sentence = _sentence(rng)
+                roll = rng.random()
+                if roll < email_rate:
+                    sentence += f" Contact {rng.choice(_WORDS)}.{rng.randint(1, 999)}@example{rng.randint(1, 50)}.com."
+                elif roll < email_rate + number_rate:
+                    sentence += f" Total {rng.randint(0, 100000)} items."
+                paragraph.append(sentence)
+            text = " ".join(paragraph) + "\n\n"
+            f.write(text)
+            written += len(text)
+    return path
+
+def make_log(path, lines, seed=2):
+    """Write a log file with timestamped lines of varying level and length."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        batch = []
+        for i in range(lines):
+            seconds = i // 50
+            batch.append(f"2024-01-01 {seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}."
+                         f"{i % 1000:03d} {rng.choice(_LEVELS)} [worker-{rng.randint(1, 16)}] "
+                         f"{_sentence(rng, 3, 12)} id={rng.randint(0, 10 ** 6)}\n")
+            if len(batch) >= 10000:
+                f.writelines(batch)
+                batch = []
+        f.writelines(batch)
+    return path
+
+def make_measurement_csv(path, rows, seed=5):
+    """Write a CSV of sensor readings (temperature in Celsius, distance in km)."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write("timestamp,sensor,temperature,distance\n")
+        batch = []
+        for i in range(rows):
+            batch.append(f"{1704067200 + i},sensor-{rng.randint(1, 64)},{rng.uniform(-30, 45):.2f},"
+                         f"{rng.uniform(0, 500):.3f}\n")
+            if len(batch) >= 10000:
+                f.writelines(batch)
+                batch = []
+        f.writelines(batch)
+    return path
+
+def make_flat_directory(path, count, seed=3, max_size=4096):
+    """Create count small files of random size in a single directory."""
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    extensions = (".txt", ".log", ".csv", ".py", ".json", ".dat")
+    for i in range(count):
+        size = rng.randint(0, max_size)
+        with open(os.path.join(path, f"file_{i:07d}{rng.choice(extensions)}"), 'wb') as f:
+            f.write(b"x" * (size - 1) + b"\n" if size else b"")
+    return path
+
+def make_deep_tree(path, depth, fanout, files_per_dir, seed=4):
+    """
+    Create a directory tree depth levels deep with fanout subdirectories and
+    files_per_dir small text files in every directory.
+    """
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    level = [path]
+    for current_depth in range(depth + 1):
+        next_level = []
+        for directory in level:
+            for i in range(files_per_dir):
+                with open(os.path.join(directory, f"doc_{i:03d}.txt"), 'w', encoding='utf-8', newline='\n') as f:
+                    f.write("\n".join(_sentence(rng) for _ in range(rng.randint(1, 20))) + "\n")
+            if current_depth < depth:
+                for i in range(fanout):
+                    child = os.path.join(directory, f"dir_{i:02d}")
+                    os.makedirs(child, exist_ok=True)
+                    next_level.append(child)
+        level = next_level
+    return path
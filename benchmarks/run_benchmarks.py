@@ -0,0 +1,461 @@
+"""Benchmark harness for the hot paths of the file and text utilities.
+
+Generates (and caches) test data, times every benchmark a number of times,
+writes the results as JSON and compares them against a saved baseline.
+A benchmark whose median time exceeds the baseline by more than the
+threshold counts as a regression and makes the run exit with status 1.
+
+Examples:
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py -k file_operations --output results.json
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import fnmatch
+import platform
+import argparse
+import datetime
+import tempfile
+import statistics
+import contextlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "UtilityHub"))
+
+from generators import make_text_corpus, make_log, make_measurement_csv, make_flat_directory, make_deep_tree
+
+# Bump when the generated data changes, so cached data is not reused
+DATA_VERSION = 1
+
+# Bump when the layout of the result files changes
+RESULTS_VERSION = 1
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# A median this much slower than the baseline (0.15 = 15 %) is a regression
+DEFAULT_THRESHOLD = 0.15
+
+DEFAULT_REPEAT = 5
+
+class Dataset:
+    """Benchmark data, generated on first use and cached across runs."""
+    
+    def __init__(self, data_dir, scale=1.0):
+        self.scale = scale
+        self.root = os.path.join(data_dir, f"v{DATA_VERSION}_scale{scale:g}")
+        self.work = os.path.join(self.root, "work")
+        os.makedirs(self.work, exist_ok=True)
+    
+    def _cached(self, name, create):
+        path = os.path.join(self.root, name)
+        marker = path + ".done"
+        if not os.path.exists(marker):
+            print(f"Generating {name}...", file=sys.stderr)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            create(path)
+            open(marker, 'w').close()
+        return path
+    
+    def _count(self, base):
+        return max(1, int(base * self.scale))
+    
+    @property
+    def corpus(self):
+        """Prose text of about 8 MB."""
+        return self._cached("corpus.txt", lambda path: make_text_corpus(path, self._count(8 * 1024 * 1024)))
+    
+    @property
+    def log(self):
+        """Log file with 500,000 lines."""
+        return self._cached("big.log", lambda path: make_log(path, self._count(500000)))
+    
+    @property
+    def measurements(self):
+        """CSV file with 500,000 rows of sensor readings."""
+        return self._cached("measurements.csv", lambda path: make_measurement_csv(path, self._count(500000)))
+    
+    @property
+    def flat_dir(self):
+        """One directory with 20,000 files."""
+        return self._cached("flat", lambda path: make_flat_directory(path, self._count(20000)))
+    
+    @property
+    def deep_tree(self):
+        """Tree 6 levels deep with 3 subdirectories and 5 files per directory."""
+        return self._cached("tree", lambda path: make_deep_tree(path, 6, 3, self._count(5)))
+    
+    def work_path(self, name):
+        """Return a scratch path for benchmark output, removing what is there."""
+        path = os.path.join(self.work, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+        return path
+
+BENCHMARKS = []
+
+def benchmark(name, unit):
+    """
+    Register a benchmark.
+    
+    The decorated function receives the Dataset and returns run() or
+    (setup, run); setup() is called untimed before every run(), and run()
+    returns the number of processed units.
+    """
+    def register(func):
+        BENCHMARKS.append((name, unit, func))
+        return func
+    return register
+
+def _matches(name, pattern):
+    return fnmatch.fnmatch(name, pattern) or pattern in name
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+# util_file_operations
+
+@benchmark("file_operations.count_lines", "lines")
+def bench_count_lines(data):
+    from util_file_operations import count_lines
+    return lambda: count_lines(data.log)
+
+@benchmark("file_operations.count_lines_many", "files")
+def bench_count_lines_many(data):
+    from util_file_operations import count_lines_many
+    return lambda: len(count_lines_many(data.deep_tree, recursive=True)['files'])
+
+@benchmark("file_operations.search_text", "lines")
+def bench_search_text(data):
+    from util_file_operations import search_text, count_lines
+    lines = count_lines(data.log)
+    def run():
+        search_text(data.log, "ERROR")
+        return lines
+    return run
+
+@benchmark("file_operations.search_files", "files")
+def bench_search_files(data):
+    from util_file_operations import search_files, iter_files
+    files = [entry.path for entry in iter_files(data.deep_tree)]
+    def run():
+        for _ in search_files(["parallel worker", r"\bmemory\b", "index"], files):
+            pass
+        return len(files)
+    return run
+
+@benchmark("file_operations.iter_files", "files")
+def bench_iter_files(data):
+    from util_file_operations import iter_files
+    return lambda: sum(1 for _ in iter_files(data.deep_tree, pattern="*.txt"))
+
+@benchmark("file_operations.list_files", "files")
+def bench_list_files(data):
+    from util_file_operations import list_files
+    return lambda: len(list_files(data.flat_dir))
+
+# util_text_processor
+
+@benchmark("text_processor.word_count", "bytes")
+def bench_word_count(data):
+    from util_text_processor import word_count
+    text = _read(data.corpus)
+    def run():
+        word_count(text)
+        return len(text)
+    return run
+
+@benchmark("text_processor.word_count_file", "bytes")
+def bench_word_count_file(data):
+    from util_text_processor import word_count_file
+    size = os.path.getsize(data.corpus)
+    def run():
+        word_count_file(data.corpus)
+        return size
+    return run
+
+@benchmark("text_processor.format_text", "bytes")
+def bench_format_text(data):
+    from util_text_processor import format_text
+    text = _read(data.corpus)
+    return lambda: len(format_text(text, 'title', remove_punctuation=True, remove_numbers=True))
+
+@benchmark("text_processor.format_text_file", "bytes")
+def bench_format_text_file(data):
+    from util_text_processor import format_text_file
+    output = os.path.join(data.work, "formatted.txt")
+    size = os.path.getsize(data.corpus)
+    def run():
+        format_text_file(data.corpus, output, 'sentence', remove_punctuation=True, remove_numbers=True)
+        return size
+    return run
+
+@benchmark("text_processor.extract_emails", "bytes")
+def bench_extract_emails(data):
+    from util_text_processor import extract_emails
+    text = _read(data.corpus)
+    def run():
+        extract_emails(text)
+        return len(text)
+    return run
+
+@benchmark("text_processor.extract_all", "bytes")
+def bench_extract_all(data):
+    from util_text_processor import extract_all
+    size = os.path.getsize(data.corpus)
+    def run():
+        extract_all(data.corpus)
+        return size
+    return run
+
+# util_converter
+
+@benchmark("converter.celsius_to_fahrenheit", "values")
+def bench_celsius_to_fahrenheit(data):
+    from util_converter import celsius_to_fahrenheit
+    values = [i / 10 for i in range(int(100000 * data.scale))]
+    def run():
+        for value in values:
+            celsius_to_fahrenheit(value)
+        return len(values)
+    return run
+
+@benchmark("converter.kilometers_to_miles", "values")
+def bench_kilometers_to_miles(data):
+    from util_converter import kilometers_to_miles
+    values = [i / 10 for i in range(int(100000 * data.scale))]
+    def run():
+        for value in values:
+            kilometers_to_miles(value)
+        return len(values)
+    return run
+
+@benchmark("converter.convert_batch", "values")
+def bench_convert_batch(data):
+    from util_converter import convert_batch
+    values = [i / 10 for i in range(int(100000 * data.scale))]
+    return lambda: len(convert_batch(values, "celsius_to_fahrenheit"))
+
+@benchmark("converter.convert_csv", "rows")
+def bench_convert_csv(data):
+    from util_converter import convert_csv
+    output = os.path.join(data.work, "measurements_converted.csv")
+    def run():
+        return convert_csv(data.measurements, output, "temperature", "C", "F")['rows']
+    return run
+
+# util_FileLister
+
+@benchmark("file_lister.export_sorted_txt", "files")
+def bench_export_sorted(data):
+    from util_FileLister import export_filenames_list
+    output = os.path.join(data.work, "export.txt")
+    count = len(os.listdir(data.flat_dir))
+    def run():
+        export_filenames_list(data.flat_dir, output)
+        return count
+    return run
+
+@benchmark("file_lister.export_recursive_csv", "files")
+def bench_export_recursive(data):
+    from util_FileLister import export_filenames_list
+    from util_file_operations import iter_files
+    output = os.path.join(data.work, "export.csv")
+    count = sum(1 for _ in iter_files(data.deep_tree))
+    def run():
+        export_filenames_list(data.deep_tree, output, recursive=True, output_format="csv", sort=False)
+        return count
+    return run
+
+@benchmark("file_lister.export_external_sort", "files")
+def bench_export_external_sort(data):
+    from util_FileLister import export_filenames_list
+    output = os.path.join(data.work, "export_spill.txt")
+    count = len(os.listdir(data.flat_dir))
+    def run():
+        # A tiny memory budget forces the sort to spill runs to disk
+        export_filenames_list(data.flat_dir, output, sort_memory_mb=1)
+        return count
+    return run
+
+# util_EmptyFileCopy
+
+@benchmark("empty_copy.mirror_tree", "files")
+def bench_mirror(data):
+    from util_EmptyFileCopy import mirror_empty_files
+    target = os.path.join(data.work, "mirror")
+    setup = lambda: data.work_path("mirror")
+    return setup, lambda: mirror_empty_files(data.deep_tree, target)['files']
+
+@benchmark("empty_copy.mirror_incremental", "files")
+def bench_mirror_incremental(data):
+    from util_EmptyFileCopy import mirror_empty_files
+    target = data.work_path("mirror_incremental")
+    mirror_empty_files(data.deep_tree, target)
+    def run():
+        stats = mirror_empty_files(data.deep_tree, target, incremental=True)
+        return stats['files'] + stats['skipped']
+    return run
+
+def run_benchmark(func, data, repeat, warmup=1):
+    """Time one benchmark and return its result entry."""
+    times = []
+    items = 0
+    # Utilities print their results; that output is not part of the measurement
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        case = func(data)
+        setup, run = case if isinstance(case, tuple) else (None, case)
+        for i in range(warmup + repeat):
+            if setup is not None:
+                setup()
+            gc.collect()
+            start = time.perf_counter()
+            items = run()
+            elapsed = time.perf_counter() - start
+            if i >= warmup:
+                times.append(elapsed)
+    
+    median = statistics.median(times)
+    return {
+        'items': items,
+        'runs': times,
+        'min': min(times),
+        'median': median,
+        'items_per_second': items / median if median else None,
+    }
+
+def run_benchmarks(pattern="*", scale=1.0, repeat=DEFAULT_REPEAT, data_dir=None):
+    """
+    Run all benchmarks whose name matches pattern.
+    
+    Returns:
+        dict: Result document with environment information and 'results'
+    """
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), "utility_hub_bench")
+    data = Dataset(data_dir, scale)
+    
+    results = {}
+    for name, unit, func in BENCHMARKS:
+        if not _matches(name, pattern):
+            continue
+        entry = run_benchmark(func, data, repeat)
+        entry['unit'] = unit
+        results[name] = entry
+        rate = entry['items_per_second']
+        print(f"{name:<40} {entry['median'] * 1000:10.1f} ms  "
+              f"{rate:14,.0f} {unit}/s" if rate else f"{name:<40} {entry['median'] * 1000:10.1f} ms",
+              file=sys.stderr)
+    
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'scale': scale,
+        'repeat': repeat,
+        'results': results,
+    }
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results against a baseline.
+    
+    Returns:
+        list: (name, baseline median, current median, relative change, status)
+              with status 'ok', 'faster', 'REGRESSION', 'new' or 'missing'
+    """
+    rows = []
+    base_results = baseline.get('results', {})
+    for name, entry in current['results'].items():
+        base = base_results.get(name)
+        if base is None:
+            rows.append((name, None, entry['median'], None, 'new'))
+            continue
+        change = entry['median'] / base['median'] - 1 if base['median'] else 0.0
+        if change > threshold:
+            status = 'REGRESSION'
+        elif change < -threshold:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, base['median'], entry['median'], change, status))
+    for name, base in base_results.items():
+        if name not in current['results']:
+            rows.append((name, base['median'], None, None, 'missing'))
+    return rows
+
+def print_comparison(rows, out=sys.stderr):
+    print(f"\n{'benchmark':<40} {'baseline':>11} {'current':>11} {'change':>8}  status", file=out)
+    for name, base, current, change, status in rows:
+        base_text = f"{base * 1000:9.1f}ms" if base is not None else f"{'-':>11}"
+        current_text = f"{current * 1000:9.1f}ms" if current is not None else f"{'-':>11}"
+        change_text = f"{change:+8.1%}" if change is not None else f"{'-':>8}"
+        print(f"{name:<40} {base_text} {current_text} {change_text}  {status}", file=out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the utility benchmarks and compare them against a baseline.")
+    parser.add_argument("-k", "--filter", default="*", help="Only run benchmarks matching this pattern or substring")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale factor for the generated data (default: 1)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per benchmark")
+    parser.add_argument("-o", "--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown counted as a regression (default: 0.15)")
+    parser.add_argument("--data-dir", help="Directory for the generated data (default: system temp directory)")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args(argv)
+    
+    if args.list:
+        for name, unit, _ in BENCHMARKS:
+            print(f"{name} ({unit})")
+        return 0
+    
+    current = run_benchmarks(args.filter, args.scale, max(1, args.repeat), args.data_dir)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}", file=sys.stderr)
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline to compare against; save one with --save-baseline.", file=sys.stderr)
+        return 0
+    
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('scale') != current['scale']:
+        print(f"\nBaseline was measured at scale {baseline.get('scale')}, not {current['scale']}; "
+              f"times are not comparable.", file=sys.stderr)
+        return 2
+    
+    # Benchmarks excluded by the filter are not missing
+    baseline['results'] = {name: entry for name, entry in baseline.get('results', {}).items()
+                           if _matches(name, args.filter)}
+    rows = compare(current, baseline, args.threshold)
+    print_comparison(rows)
+    regressions = [row for row in rows if row[4] == 'REGRESSION']
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}.", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Thread-safe progress and status events for the Tkinter utilities.
+
+Worker threads must not touch Tk widgets. Instead they post events to an
+EventChannel, which the Tk main loop drains on a fixed after() interval.
+Events of the same kind that arrive within one interval are coalesced, so
+a worker can report progress for every file without flooding the UI.
+"""
+
+import queue
+import traceback
+import tkinter as tk
+
+# Default drain interval in milliseconds
+DEFAULT_INTERVAL_MS = 50
+
+# Upper bound of events handled per drain, keeps the UI responsive under load
+MAX_EVENTS_PER_DRAIN = 10000
+
+_CALL = object()
+
+class EventChannel:
+    def __init__(self, root, interval_ms=DEFAULT_INTERVAL_MS):
+        """
+        Create a channel drained by the main loop of root.
+        
+        Args:
+            root: Any Tk widget; its after() timer is used for draining
+            interval_ms (int): Drain interval in milliseconds
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._handlers = {}
+        self.root.after(self.interval_ms, self._drain)
+    
+    def subscribe(self, kind, handler, batch=False):
+        """
+        Register the main-thread handler for an event kind.
+        
+        By default only the latest payload posted during an interval is
+        delivered (handler(payload)). With batch=True all payloads are
+        delivered at once in posting order (handler([payload, ...])).
+        """
+        self._handlers[kind] = (handler, batch)
+    
+    def post(self, kind, payload=None):
+        """Post an event. Safe to call from any thread."""
+        self._queue.put((kind, payload))
+    
+    def call(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on the main thread. Calls are never coalesced."""
+        self._queue.put((_CALL, (func, args, kwargs)))
+    
+    @staticmethod
+    def _deliver(func, *args, **kwargs):
+        """Run one handler or call; an error is logged and does not stop the drain."""
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            traceback.print_exc()
+    
+    def _drain(self):
+        """Deliver all queued events; rescheduled on every interval."""
+        latest = {}
+        batches = {}
+        calls = []
+        try:
+            for _ in range(MAX_EVENTS_PER_DRAIN):
+                try:
+                    kind, payload = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                
+                if kind is _CALL:
+                    calls.append(payload)
+                elif kind in self._handlers and self._handlers[kind][1]:
+                    batches.setdefault(kind, []).append(payload)
+                else:
+                    latest[kind] = payload
+            
+            for kind, payload in latest.items():
+                if kind in self._handlers:
+                    self._deliver(self._handlers[kind][0], payload)
+            for kind, payloads in batches.items():
+                self._deliver(self._handlers[kind][0], payloads)
+            
+            # Calls run last so they see the widgets already updated
+            for func, args, kwargs in calls:
+                self._deliver(func, *args, **kwargs)
+        finally:
+            try:
+                self.root.after(self.interval_ms, self._drain)
+            except tk.TclError:
+                pass  # The window has been destroyed
@@ -1,7 +1,318 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import sys
+import json
+import time
+import shutil
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from gui_events import EventChannel
+
+# Number of threads creating files in parallel
+DEFAULT_WORKERS = 16
+
+# Number of files handed to a worker thread at once
+BATCH_SIZE = 256
+
+# Progress journal in the target directory, used to resume interrupted runs
+PROGRESS_FILE = ".empty_copy_progress"
+
+def scan_source_tree(source_dir, recursive=True, with_stat=False, errors=None):
+    """
+    Scan the source tree once with os.scandir.
+    
+    With with_stat, the stat result of every file and directory is kept
+    (os.scandir provides it without extra calls on Windows). Subdirectories
+    and files that cannot be read are skipped and reported in errors.
+    
+    Args:
+        errors (list, optional): Receives a message for every skipped entry
+    
+    Returns:
+        list: (relative_directory, directory_stat, [(file name, file_stat)]) tuples,
+              parents before children. Stats are None unless with_stat is set.
+    """
+    plan = []
+    pending = [("", os.stat(source_dir) if with_stat else None)]
+    while pending:
+        relative_dir, dir_stat = pending.pop()
+        directory = os.path.join(source_dir, relative_dir)
+        files = []
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            files.append((entry.name, entry.stat() if with_stat else None))
+                        elif recursive and entry.is_dir(follow_symlinks=False):
+                            subdirectories.append((os.path.join(relative_dir, entry.name),
+                                                   entry.stat(follow_symlinks=False) if with_stat else None))
+                    except OSError as e:
+                        if errors is not None:
+                            errors.append(f"{entry.path}: {e}")
+        except OSError as e:
+            # The source root itself must be readable
+            if not relative_dir:
+                raise
+            if errors is not None:
+                errors.append(f"{directory}: {e}")
+            continue
+        plan.append((relative_dir, dir_stat, files))
+        pending.extend(reversed(subdirectories))
+    return plan
+
+def _mark_sparse(f):
+    """Mark an open file as sparse on NTFS so extending it allocates no disk space."""
+    if sys.platform != 'win32':
+        return  # Most other file systems create sparse files by default
+    try:
+        import ctypes
+        import msvcrt
+        from ctypes import wintypes
+        
+        FSCTL_SET_SPARSE = 0x000900C4
+        returned = wintypes.DWORD()
+        ctypes.windll.kernel32.DeviceIoControl(
+            wintypes.HANDLE(msvcrt.get_osfhandle(f.fileno())), FSCTL_SET_SPARSE,
+            None, 0, None, 0, ctypes.byref(returned), None)
+    except (ImportError, OSError, AttributeError):
+        pass  # Fall back to a regular (non-sparse) file
+
+def _create_empty_batch(target_dir, files):
+    """
+    Create empty files in target_dir. Returns (created, errors).
+    
+    files holds (name, stat) pairs. If a stat is given, the file becomes a
+    sparse placeholder with the source's size, access and modification time.
+    """
+    created = 0
+    errors = []
+    for filename, stat in files:
+        target_path = os.path.join(target_dir, filename)
+        try:
+            with open(target_path, 'wb') as f:
+                if stat is not None and stat.st_size:
+                    _mark_sparse(f)
+                    f.truncate(stat.st_size)
+            if stat is not None:
+                os.utime(target_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            created += 1
+        except OSError as e:
+            errors.append(f"{target_path}: {e}")
+    return created, errors
+
+def _scan_target_directory(directory):
+    """Return ({file name: DirEntry}, directory names) currently in a target directory."""
+    files = {}
+    directories = set()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.add(entry.name)
+                else:
+                    files[entry.name] = entry
+    except FileNotFoundError:
+        pass
+    return files, directories
+
+def _load_progress(progress_path, source_dir):
+    """
+    Return the set of directories completed by an interrupted earlier run.
+    
+    The first line of the journal names the source directory of the run;
+    a journal of another source is ignored.
+    """
+    try:
+        with open(progress_path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline() or "null")
+            if not isinstance(header, dict) or header.get('source') != source_dir:
+                return set()
+            return {json.loads(line) for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+    except (OSError, ValueError):
+        # A damaged journal only means less work can be skipped
+        return set()
+
+def _placeholder_matches(entry, stat):
+    """Check whether an existing target file already mirrors the source metadata."""
+    try:
+        target_stat = entry.stat()
+    except OSError:
+        return False
+    return target_stat.st_size == stat.st_size and target_stat.st_mtime_ns == stat.st_mtime_ns
+
+def mirror_empty_files(source_dir, target_dir, recursive=True, workers=DEFAULT_WORKERS, progress_callback=None,
+                       incremental=False, prune=False, resume=False, placeholders=False):
+    """
+    Create empty copies of all files from source_dir in target_dir.
+    
+    The directory structure is recreated first (parents before children)
+    and files are created in batches on a bounded thread pool, so the
+    latency of many small file system operations overlaps.
+    
+    Directories whose files were all created are recorded in a progress
+    journal in target_dir, which is removed when the run finishes without
+    failed files. If a run is interrupted, a run with resume=True from the
+    same source skips the directories listed there.
+    
+    Args:
+        source_dir (str): Directory to mirror
+        target_dir (str): Directory in which the empty files are created
+        recursive (bool): Also mirror all subdirectories
+        workers (int): Number of threads creating files
+        progress_callback (function, optional): Called as callback(done, total)
+        incremental (bool): Only create files missing in the target. Each target
+                            directory is scanned once and existing files are kept.
+        prune (bool): With incremental, delete target files and subdirectories
+                      that no longer exist in the source
+        resume (bool): Skip directories completed by an interrupted earlier run
+                       from the same source directory
+        placeholders (bool): Give every copy the source's logical size (as a sparse
+                             file that uses no disk blocks) and its access and
+                             modification times, so size and date based tools work
+                             on the mirrored tree
+    
+    Returns:
+        dict: 'files', 'skipped', 'pruned', 'directories', 'errors' (list of
+              messages), 'seconds' and 'files_per_second'
+    """
+    start = time.perf_counter()
+    errors = []
+    plan = scan_source_tree(source_dir, recursive, with_stat=placeholders, errors=errors)
+    total = sum(len(files) for _, _, files in plan)
+    
+    os.makedirs(target_dir, exist_ok=True)
+    progress_path = os.path.join(target_dir, PROGRESS_FILE)
+    source_key = os.path.realpath(source_dir)
+    completed = _load_progress(progress_path, source_key) if resume else set()
+    
+    # Subdirectory names per source directory, needed for pruning
+    source_children = {}
+    for relative_dir, _, _ in plan:
+        if relative_dir:
+            parent, name = os.path.split(relative_dir)
+            source_children.setdefault(parent, set()).add(name)
+    
+    created = 0
+    skipped = 0
+    pruned = 0
+    # Files that could not be created; errors also holds scan and prune errors
+    failed = 0
+    remaining = {}
+    batch_dirs = {}
+    # Directories with files that could not be created; they are not journaled
+    failed_dirs = set()
+    
+    # Continue the journal of the run being resumed, otherwise start a new one
+    with open(progress_path, 'a' if completed else 'w', encoding='utf-8') as journal:
+        if not completed:
+            journal.write(json.dumps({'source': source_key}) + "\n")
+        
+        def finish_directory(relative_dir):
+            journal.write(json.dumps(relative_dir) + "\n")
+            journal.flush()
+        
+        def collect(done):
+            nonlocal created, failed
+            for future in done:
+                relative_dir = batch_dirs.pop(future)
+                batch_created, batch_errors = future.result()
+                created += batch_created
+                failed += len(batch_errors)
+                errors.extend(batch_errors)
+                if batch_errors:
+                    failed_dirs.add(relative_dir)
+                remaining[relative_dir] -= 1
+                if not remaining[relative_dir]:
+                    del remaining[relative_dir]
+                    if relative_dir not in failed_dirs:
+                        finish_directory(relative_dir)
+            if progress_callback:
+                progress_callback(created + skipped + failed, total)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for relative_dir, _, files in plan:
+                if relative_dir in completed:
+                    skipped += len(files)
+                    continue
+                
+                directory = os.path.join(target_dir, relative_dir)
+                os.makedirs(directory, exist_ok=True)
+                
+                if incremental:
+                    existing_files, existing_dirs = _scan_target_directory(directory)
+                    missing = [(name, stat) for name, stat in files
+                               if name not in existing_files
+                               or (stat is not None and not _placeholder_matches(existing_files[name], stat))]
+                    skipped += len(files) - len(missing)
+                    
+                    if prune:
+                        stale_files = existing_files.keys() - {name for name, _ in files}
+                        if not relative_dir:
+                            stale_files.discard(PROGRESS_FILE)
+                        for name in stale_files:
+                            try:
+                                os.remove(os.path.join(directory, name))
+                                pruned += 1
+                            except OSError as e:
+                                errors.append(f"{os.path.join(directory, name)}: {e}")
+                        
+                        # Without recursion the source subdirectories are unknown
+                        if recursive:
+                            for name in existing_dirs - source_children.get(relative_dir, set()):
+                                try:
+                                    shutil.rmtree(os.path.join(directory, name))
+                                    pruned += 1
+                                except OSError as e:
+                                    errors.append(f"{os.path.join(directory, name)}: {e}")
+                    files = missing
+                
+                if not files:
+                    finish_directory(relative_dir)
+                    continue
+                
+                for i in range(0, len(files), BATCH_SIZE):
+                    future = executor.submit(_create_empty_batch, directory, files[i:i + BATCH_SIZE])
+                    batch_dirs[future] = relative_dir
+                    remaining[relative_dir] = remaining.get(relative_dir, 0) + 1
+                    pending.add(future)
+                    
+                    # Keep the number of queued batches bounded
+                    if len(pending) >= workers * 4:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+            
+            if pending:
+                collect(wait(pending).done)
+    
+    # The run is complete; keep the journal if files failed, so resuming retries them
+    if not failed_dirs:
+        os.remove(progress_path)
+    
+    # Creating files changed the directory times, so restore them children first
+    if placeholders:
+        for relative_dir, dir_stat, _ in reversed(plan):
+            try:
+                os.utime(os.path.join(target_dir, relative_dir), ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+            except OSError as e:
+                errors.append(f"{os.path.join(target_dir, relative_dir)}: {e}")
+    
+    seconds = time.perf_counter() - start
+    return {
+        'files': created,
+        'skipped': skipped,
+        'pruned': pruned,
+        'directories': len(plan),
+        'errors': errors,
+        'seconds': seconds,
+        'files_per_second': created / seconds if seconds > 0 else 0.0,
+    }
 
 class EmptyFileCopierGUI:
     def __init__(self, parent_frame):
@@ -14,6 +325,11 @@ class EmptyFileCopierGUI:
         self.target_dir = tk.StringVar()
         self.status_text = tk.StringVar(value="Ready to copy files")
         self.progress_var = tk.DoubleVar(value=0.0)
+        self.recursive = tk.BooleanVar(value=False)
+        self.incremental = tk.BooleanVar(value=False)
+        self.prune = tk.BooleanVar(value=False)
+        self.placeholders = tk.BooleanVar(value=False)
+        self.resume = tk.BooleanVar(value=False)
         
         # Create a frame for directory selection (side by side)
         dir_frame = ttk.Frame(self.mainframe)
@@ -45,6 +361,19 @@ class EmptyFileCopierGUI:
         self.copy_button = ttk.Button(bottom_frame, text="Create Empty Copies", command=self.start_copy, width=18)
         self.copy_button.pack(side=tk.LEFT, pady=2)
         
+        # Recursive mirror option
+        ttk.Checkbutton(bottom_frame, text="Include subfolders", variable=self.recursive).pack(side=tk.LEFT, padx=(5, 0), pady=2)
+        
+        # Incremental options: only create missing files, optionally remove stale ones
+        ttk.Checkbutton(bottom_frame, text="Only missing", variable=self.incremental).pack(side=tk.LEFT, padx=(5, 0), pady=2)
+        ttk.Checkbutton(bottom_frame, text="Remove stale", variable=self.prune).pack(side=tk.LEFT, padx=(5, 0), pady=2)
+        
+        # Placeholder option: sparse files with the source's size and dates
+        ttk.Checkbutton(bottom_frame, text="Keep size & dates", variable=self.placeholders).pack(side=tk.LEFT, padx=(5, 0), pady=2)
+        
+        # Resume option: skip folders finished by an interrupted run from the same source
+        ttk.Checkbutton(bottom_frame, text="Resume", variable=self.resume).pack(side=tk.LEFT, padx=(5, 0), pady=2)
+        
         # Progress bar - remove height parameter
         self.progress = ttk.Progressbar(bottom_frame, orient=tk.HORIZONTAL, length=100, 
                                        mode='determinate', variable=self.progress_var)
@@ -53,6 +382,11 @@ class EmptyFileCopierGUI:
         # Status label - on same row
         self.status_label = ttk.Label(bottom_frame, textvariable=self.status_text, font=('Arial', 9))
         self.status_label.pack(side=tk.RIGHT, pady=2)
+        
+        # Worker threads report through the event channel, the main loop applies the updates
+        self.events = EventChannel(self.mainframe)
+        self.events.subscribe("status", self.status_text.set)
+        self.events.subscribe("progress", self.progress_var.set)
     
     def browse_source(self):
         """Open a file dialog to select the source directory."""
@@ -67,8 +401,8 @@ class EmptyFileCopierGUI:
             self.target_dir.set(directory)
     
     def update_status(self, message):
-        """Update the status text."""
-        self.status_text.set(message)
+        """Update the status text. Safe to call from the worker thread."""
+        self.events.post("status", message)
     
     def start_copy(self):
         """Start the copy process in a separate thread."""
@@ -85,15 +419,31 @@ class EmptyFileCopierGUI:
                                   "Source and target directories must be different.")
             return
         
+        recursive = self.recursive.get()
+        incremental = self.incremental.get()
+        prune = incremental and self.prune.get()
+        
+        if recursive and os.path.abspath(target).startswith(os.path.join(os.path.abspath(source), "")):
+            messagebox.showwarning("Invalid Selection", 
+                                  "The target directory must not be inside the source directory.")
+            return
+        
+        if prune and not messagebox.askyesno("Remove Stale Files",
+                                             "Files and folders in the target that do not exist in the source "
+                                             "will be deleted. Continue?"):
+            return
+        
         # Disable the copy button during processing
         self.copy_button.config(state=tk.DISABLED)
         
         # Run the copy process in a separate thread to keep UI responsive
         threading.Thread(target=self.create_empty_copies, 
-                         args=(source, target), 
+                         args=(source, target, recursive, incremental, prune, self.placeholders.get(),
+                               self.resume.get()), 
                          daemon=True).start()
     
-    def create_empty_copies(self, source_dir, target_dir):
+    def create_empty_copies(self, source_dir, target_dir, recursive=False, incremental=False, prune=False,
+                            placeholders=False, resume=False):
         """Creates empty copies of all files from source_dir in target_dir."""
         try:
             # Create target directory if it doesn't exist
@@ -101,42 +451,42 @@ class EmptyFileCopierGUI:
                 os.makedirs(target_dir)
                 self.update_status(f"Created target directory: {target_dir}")
             
-            # Get list of files in source directory (non-recursive)
-            files = [f for f in os.listdir(source_dir) if os.path.isfile(os.path.join(source_dir, f))]
+            # Reset progress bar
+            self.events.post("progress", 0)
+            
+            def on_progress(done, total):
+                self.events.post("progress", (done / total) * 100)
+                self.update_status(f"Created {done}/{total} files")
+            
+            result = mirror_empty_files(source_dir, target_dir, recursive, progress_callback=on_progress,
+                                        incremental=incremental, prune=prune, resume=resume,
+                                        placeholders=placeholders)
             
-            if not files:
+            if not result['files'] and not result['skipped'] and not result['pruned'] and not result['errors']:
                 self.update_status(f"No files found in {source_dir}")
                 return
             
-            # Reset progress bar
-            self.progress_var.set(0)
-            total_files = len(files)
-            
-            # Create empty copies
-            for i, filename in enumerate(files):
-                source_path = os.path.join(source_dir, filename)
-                target_path = os.path.join(target_dir, filename)
-                
-                # Create empty file with same name
-                with open(target_path, 'w') as f:
-                    pass  # Create empty file
-                
-                # Update progress
-                progress_pct = ((i + 1) / total_files) * 100
-                self.progress_var.set(progress_pct)
-                self.update_status(f"Created: {filename} ({i+1}/{total_files})")
-            
             # Final status update
-            self.update_status(f"Completed! Created {len(files)} empty files in {target_dir}")
-            messagebox.showinfo("Complete", f"Successfully created {len(files)} empty files.")
+            summary = f"Completed! Created {result['files']} empty files in {target_dir} ({result['files_per_second']:.0f} files/s)"
+            if result['skipped']:
+                summary += f", {result['skipped']} already present"
+            if result['pruned']:
+                summary += f", {result['pruned']} stale removed"
+            self.update_status(summary)
+            if result['errors']:
+                self.events.call(messagebox.showwarning, "Completed with errors",
+                                 f"Created {result['files']} empty files, "
+                                 f"{len(result['errors'])} failed:\n" + "\n".join(result['errors'][:10]))
+            else:
+                self.events.call(messagebox.showinfo, "Complete", f"Successfully created {result['files']} empty files.")
             
         except Exception as e:
             self.update_status(f"Error: {e}")
-            messagebox.showerror("Error", str(e))
+            self.events.call(messagebox.showerror, "Error", str(e))
         
         finally:
             # Re-enable the copy button
-            self.copy_button.config(state=tk.NORMAL) 
+            self.events.call(self.copy_button.config, state=tk.NORMAL) 
 if __name__ == "__main__":
     root = tk.Tk()
     root.title("Empty File Copier")
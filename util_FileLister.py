@@ -1,18 +1,216 @@
 import os
 import sys
+import csv
+import json
+import heapq
+import pickle
 import datetime
+import tempfile
+import itertools
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from threading import Thread
 
-def export_filenames_list(folder_path, output_file=None, status_callback=None):
+from gui_events import EventChannel
+
+# Supported export formats and their default file extensions
+EXPORT_FORMATS = {
+    "txt": ".txt",
+    "csv": ".csv",
+    "tsv": ".tsv",
+    "jsonl": ".jsonl",
+}
+
+# Number of entries collected before they are written in one batch
+WRITE_BATCH_SIZE = 10000
+
+# Buffer size of the output file
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Default memory budget for sorting before sorted runs are spilled to disk
+SORT_MEMORY_MB = 64
+
+# Rough per-entry overhead of a (name, size, mtime) record in memory
+_RECORD_OVERHEAD = 160
+
+# Maximum number of run files merged at once (limits open file handles)
+_MAX_MERGE_RUNS = 64
+
+def iter_directory_entries(folder_path, recursive=False, errors=None):
+    """
+    Lazily yield (name, DirEntry) for all files in a folder.
+    
+    Names are relative to folder_path (with '/' as separator) so recursive
+    listings stay unambiguous. Subdirectories that cannot be read are
+    skipped, as os.walk does, and reported in errors.
+    
+    Args:
+        errors (list, optional): Receives (path, OSError) for every skipped directory
+    """
+    pending = [("", folder_path)]
+    while pending:
+        prefix, path = pending.pop()
+        subdirectories = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            yield prefix + entry.name, entry
+                        elif recursive and entry.is_dir(follow_symlinks=False):
+                            subdirectories.append((f"{prefix}{entry.name}/", entry.path))
+                    except OSError:
+                        continue
+        except OSError as e:
+            # The folder itself must be readable
+            if not prefix:
+                raise
+            if errors is not None:
+                errors.append((path, e))
+        pending.extend(reversed(subdirectories))
+
+class _LineCollector(list):
+    """Minimal file-like object that collects lines written by csv.writer."""
+    
+    def write(self, line):
+        self.append(line)
+
+def _format_records(records, output_format):
+    """Turn (name, size, mtime) records into output lines for a format."""
+    if output_format == "txt":
+        return [f"{name}\n" for name, _, _ in records]
+    
+    if output_format == "jsonl":
+        return [json.dumps({"name": name, "size": size,
+                            "mtime": datetime.datetime.fromtimestamp(mtime).isoformat(timespec="seconds")},
+                           ensure_ascii=False) + "\n"
+                for name, size, mtime in records]
+    
+    # csv and tsv
+    lines = _LineCollector()
+    writer = csv.writer(lines, delimiter="\t" if output_format == "tsv" else ",", lineterminator="\n")
+    writer.writerows((name, size, datetime.datetime.fromtimestamp(mtime).isoformat(timespec="seconds"))
+                     for name, size, mtime in records)
+    return lines
+
+def _spill_run(records, temp_dir):
+    """Sort records and write them to a temporary run file."""
+    records.sort()
+    fd, run_path = tempfile.mkstemp(suffix=".run", dir=temp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        for start in range(0, len(records), WRITE_BATCH_SIZE):
+            pickle.dump(records[start:start + WRITE_BATCH_SIZE], f, pickle.HIGHEST_PROTOCOL)
+    return run_path
+
+def _read_run(run_path):
+    """Yield the records of a run file in order."""
+    with open(run_path, 'rb') as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+def _merge_runs(run_paths, temp_dir):
+    """Merge several run files into a single new run file."""
+    fd, run_path = tempfile.mkstemp(suffix=".run", dir=temp_dir)
+    merged = heapq.merge(*(_read_run(path) for path in run_paths))
+    with os.fdopen(fd, 'wb') as f:
+        while True:
+            batch = list(itertools.islice(merged, WRITE_BATCH_SIZE))
+            if not batch:
+                break
+            pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+    for path in run_paths:
+        os.remove(path)
+    return run_path
+
+def _external_sort(records, memory_budget, temp_dir, status_callback=None):
+    """
+    Sort records within a fixed memory budget.
+    
+    Records are collected until the budget is reached, then sorted and
+    spilled to a run file in temp_dir. Runs are kept in tiers of similar
+    size: once a tier holds _MAX_MERGE_RUNS runs they are merged into one
+    run of the next tier, so every record is rewritten only a logarithmic
+    number of times. The remaining runs are k-way merged lazily.
+    
+    Returns:
+        tuple: (record_count, iterator over the sorted records)
     """
-    Export a list of filenames from the specified folder to a text file.
+    tiers = []
+    buffer = []
+    used = 0
+    count = 0
+    for record in records:
+        buffer.append(record)
+        used += _RECORD_OVERHEAD + len(record[0])
+        count += 1
+        if used >= memory_budget:
+            run_path = _spill_run(buffer, temp_dir)
+            buffer = []
+            used = 0
+            level = 0
+            while True:
+                if level == len(tiers):
+                    tiers.append([])
+                tiers[level].append(run_path)
+                if len(tiers[level]) < _MAX_MERGE_RUNS:
+                    break
+                run_path = _merge_runs(tiers[level], temp_dir)
+                tiers[level] = []
+                level += 1
+            if status_callback:
+                status_callback(f"{count} Dateien gelesen, {sum(map(len, tiers))} sortierte Teile ausgelagert...")
+    
+    buffer.sort()
+    # Smallest runs first; merge them until the final merge fits the fan-in
+    runs = [run_path for tier in tiers for run_path in tier]
+    while len(runs) >= _MAX_MERGE_RUNS:
+        runs = runs[_MAX_MERGE_RUNS:] + [_merge_runs(runs[:_MAX_MERGE_RUNS], temp_dir)]
+    if not runs:
+        return count, iter(buffer)
+    
+    return count, heapq.merge(*(_read_run(run_path) for run_path in runs), buffer)
+
+def _write_header(f, folder_path, output_format, file_count=None):
+    """Write the header appropriate for the output format."""
+    if output_format == "txt":
+        f.write(f"Verzeichnis: {os.path.abspath(folder_path)}\n")
+        f.write(f"Datum: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        if file_count is not None:
+            f.write(f"Anzahl Dateien: {file_count}\n")
+        f.write("\n=== DATEINAMEN ===\n\n")
+    elif output_format == "jsonl":
+        pass
+    else:
+        delimiter = "\t" if output_format == "tsv" else ","
+        f.write(delimiter.join(("name", "size", "mtime")) + "\n")
+
+def export_filenames_list(folder_path, output_file=None, status_callback=None,
+                          recursive=False, output_format="txt", sort=True,
+                          sort_memory_mb=SORT_MEMORY_MB):
+    """
+    Export a list of filenames from the specified folder to a file.
+    
+    With sort=False the export is streamed: every entry is written as soon as
+    it is found, so memory use does not depend on the number of files.
+    Sorted exports use an external merge sort that spills sorted runs to
+    temporary files once sort_memory_mb is exceeded; the output is the same
+    as sorting everything in memory.
+    Sizes and modification times for the structured formats come from the
+    stat data cached by os.scandir.
     
     Args:
         folder_path (str): Path to the folder containing files
         output_file (str, optional): Path to output file. If None, a default name will be created.
         status_callback (function, optional): Callback for updating status
+        recursive (bool, optional): Include files in subdirectories
+        output_format (str, optional): One of 'txt', 'csv', 'tsv' or 'jsonl'
+        sort (bool, optional): Sort the filenames. If False, entries are streamed in
+                               directory order.
+        sort_memory_mb (int, optional): Memory budget for sorting in megabytes
     
     Returns:
         str: Path to the created output file
@@ -32,34 +230,83 @@ def export_filenames_list(folder_path, output_file=None, status_callback=None):
             if status_callback:
                 status_callback("FEHLER: Keine gültige Verzeichnis")
             return None
-            
-        # Get all files in the directory
-        files = [f for f in os.listdir(folder_path) if os.path.isfile(os.path.join(folder_path, f))]
         
-        if status_callback:
-            status_callback(f"{len(files)} Dateien gefunden. Exportiere...")
+        if output_format not in EXPORT_FORMATS:
+            if status_callback:
+                status_callback(f"FEHLER: Unbekanntes Format: {output_format}")
+            return None
         
         # Generate output filename if not provided
         if output_file is None:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             output_dir = os.path.dirname(folder_path) if os.path.dirname(folder_path) else "."
-            output_file = os.path.join(output_dir, f"filenames_list_{timestamp}.txt")
-        
-        # Write filenames to the output file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"Verzeichnis: {os.path.abspath(folder_path)}\n")
-            f.write(f"Datum: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Anzahl Dateien: {len(files)}\n")
-            f.write("\n=== DATEINAMEN ===\n\n")
-            
-            for filename in sorted(files):
-                f.write(f"{filename}\n")
+            output_file = os.path.join(output_dir, f"filenames_list_{timestamp}{EXPORT_FORMATS[output_format]}")
+        
+        # Sizes and times are only needed for the structured formats
+        with_stat = output_format != "txt"
+        
+        skipped_dirs = []
+        
+        # A streamed export writes while it walks; it must not list its own output
+        output_path = os.path.realpath(output_file)
+        output_name = os.path.basename(output_path)
+        
+        def records():
+            for name, entry in iter_directory_entries(folder_path, recursive, skipped_dirs):
+                if entry.name == output_name and os.path.realpath(entry.path) == output_path:
+                    continue
+                if with_stat:
+                    stat = entry.stat()
+                    yield name, stat.st_size, stat.st_mtime
+                else:
+                    yield name, None, None
+        
+        if sort:
+            with tempfile.TemporaryDirectory(prefix="filenames_sort_") as temp_dir:
+                # The tree is scanned completely before the output file is
+                # created, so an output file inside the folder is not listed
+                file_count, entries = _external_sort(records(), sort_memory_mb * 1024 * 1024,
+                                                     temp_dir, status_callback)
+                
+                if status_callback:
+                    status_callback(f"{file_count} Dateien gefunden. Exportiere...")
+                
+                with open(output_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                    _write_header(f, folder_path, output_format, file_count)
+                    while True:
+                        batch = list(itertools.islice(entries, WRITE_BATCH_SIZE))
+                        if not batch:
+                            break
+                        f.writelines(_format_records(batch, output_format))
+        else:
+            with open(output_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                _write_header(f, folder_path, output_format)
+                file_count = 0
+                batch = []
+                for record in records():
+                    batch.append(record)
+                    if len(batch) >= WRITE_BATCH_SIZE:
+                        f.writelines(_format_records(batch, output_format))
+                        file_count += len(batch)
+                        batch = []
+                        if status_callback:
+                            status_callback(f"{file_count} Dateien exportiert...")
+                f.writelines(_format_records(batch, output_format))
+                file_count += len(batch)
+                
+                # The count is only known at the end of a streamed export
+                if output_format == "txt":
+                    f.write(f"\nAnzahl Dateien: {file_count}\n")
         
         if status_callback:
-            status_callback(f"Export erfolgreich: {os.path.abspath(output_file)}")
+            message = f"Export erfolgreich: {file_count} Dateien nach {os.path.abspath(output_file)}"
+            if skipped_dirs:
+                message += (f" ({len(skipped_dirs)} Verzeichnisse nicht lesbar, z.B. "
+                            f"{skipped_dirs[0][0]}: {skipped_dirs[0][1].strerror})")
+            status_callback(message)
         
         return os.path.abspath(output_file)
-        
+    
     except Exception as e:
         error_msg = f"FEHLER: Export fehlgeschlagen: {str(e)}"
         if status_callback:
@@ -70,9 +317,13 @@ class FilenamesExporterGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Datei-Namen Exporter")
-        self.root.geometry("600x400")
+        self.root.geometry("600x430")
         self.root.minsize(500, 300)
         
+        # Status messages from the export thread are applied by the main loop in batches
+        self.events = EventChannel(self.root)
+        self.events.subscribe("status", self.append_status, batch=True)
+        
         self.create_widgets()
         
         # Set default folder to script directory if run directly
@@ -129,6 +380,25 @@ class FilenamesExporterGUI:
         # Initialize output entry state
         self.toggle_output_entry()
         
+        # Export options
+        options_frame = ttk.Frame(main_frame)
+        options_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(options_frame, text="Format:").pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.format_var = tk.StringVar(value="txt")
+        format_combo = ttk.Combobox(options_frame, textvariable=self.format_var,
+                                    values=list(EXPORT_FORMATS), state="readonly", width=8)
+        format_combo.pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.recursive_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Unterverzeichnisse einbeziehen",
+                        variable=self.recursive_var).pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.sort_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="Sortieren",
+                        variable=self.sort_var).pack(side=tk.LEFT)
+        
         # Export button
         self.export_btn = ttk.Button(main_frame, text="Dateinamen exportieren", command=self.start_export)
         self.export_btn.pack(pady=(0, 10))
@@ -168,22 +438,26 @@ class FilenamesExporterGUI:
     
     def browse_output(self):
         """Open file dialog to choose output file"""
+        extension = EXPORT_FORMATS.get(self.format_var.get(), ".txt")
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            defaultextension=extension,
+            filetypes=[(f"{self.format_var.get().upper()} files", f"*{extension}"), ("All files", "*.*")],
             initialdir=os.path.dirname(self.output_var.get() or self.folder_var.get() or os.getcwd()),
-            initialfile="filenames_list.txt"
+            initialfile=f"filenames_list{extension}"
         )
         if file_path:
             self.output_var.set(file_path)
     
     def update_status(self, message):
-        """Update status text"""
+        """Queue a status message. Safe to call from the export thread."""
+        self.events.post("status", f"{datetime.datetime.now().strftime('%H:%M:%S')} - {message}\n")
+    
+    def append_status(self, lines):
+        """Append queued status lines to the status text (main thread only)"""
         self.status_text.configure(state="normal")
-        self.status_text.insert(tk.END, f"{datetime.datetime.now().strftime('%H:%M:%S')} - {message}\n")
+        self.status_text.insert(tk.END, "".join(lines))
         self.status_text.see(tk.END)
         self.status_text.configure(state="disabled")
-        self.root.update_idletasks()
     
     def start_export(self):
         """Start the export process in a separate thread"""
@@ -207,25 +481,33 @@ class FilenamesExporterGUI:
         self.update_status(f"Starte Export aus Verzeichnis: {folder_path}")
         
         # Run export in a separate thread to keep GUI responsive
-        export_thread = Thread(target=self.run_export, args=(folder_path, output_file))
+        options = {
+            "recursive": self.recursive_var.get(),
+            "output_format": self.format_var.get(),
+            "sort": self.sort_var.get(),
+        }
+        export_thread = Thread(target=self.run_export, args=(folder_path, output_file, options))
         export_thread.daemon = True
         export_thread.start()
     
-    def run_export(self, folder_path, output_file):
+    def run_export(self, folder_path, output_file, options):
         """Run the export process"""
         try:
-            result_path = export_filenames_list(folder_path, output_file, self.update_status)
+            result_path = export_filenames_list(folder_path, output_file, self.update_status, **options)
             
             if result_path:
-                # Use messagebox to show success and ask if user wants to open the file
-                if messagebox.askyesno("Export erfolgreich", 
-                                     f"Dateiliste wurde exportiert nach:\n{result_path}\n\nMöchten Sie die Datei öffnen?"):
-                    self.open_file(result_path)
+                self.events.call(self.ask_open_file, result_path)
         except Exception as e:
             self.update_status(f"Fehler während des Exports: {str(e)}")
         
         # Re-enable the export button
-        self.root.after(0, lambda: self.export_btn.configure(state="normal"))
+        self.events.call(self.export_btn.configure, state="normal")
+    
+    def ask_open_file(self, result_path):
+        """Show success and ask if user wants to open the file (main thread only)"""
+        if messagebox.askyesno("Export erfolgreich", 
+                             f"Dateiliste wurde exportiert nach:\n{result_path}\n\nMöchten Sie die Datei öffnen?"):
+            self.open_file(result_path)
     
     def open_file(self, file_path):
         """Open the exported file with the default application"""